@@ -0,0 +1,158 @@
+import asyncio
+import inspect
+import threading
+import concurrent.futures
+import pandas as pd
+from typing import List, Optional, Callable, Iterator, Tuple, Any
+
+from backtester.data_source import DataSource
+
+def yahoo_fetch(tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+    """Blocking fetch of Adj Close prices for one ticker batch from Yahoo Finance."""
+    import yfinance as yf
+    data = yf.download(tickers, start=start_date, end=end_date, auto_adjust=False, threads=False, progress=False)
+    adj_close = data['Adj Close']
+    if isinstance(adj_close, pd.Series):
+        adj_close = adj_close.to_frame(name=tickers[0])
+    return adj_close
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        pass # loop already closed, nothing is waiting on the slot
+
+class AsyncYahooFinanceDataSource(DataSource):
+    """
+    Implementation of DataSource that fetches ticker batches concurrently on a background event loop.
+
+    Requests are split into batches of ``batch_size`` tickers, with at most ``max_concurrency`` batches
+    in flight. A plain ``fetch`` runs on a dedicated pool of ``max_concurrency`` threads and keeps its
+    slot until the call actually returns, so a timed-out download that is still running counts toward
+    the limit and its retry waits for it. Each batch attempt is bounded by ``timeout`` seconds and retried up to ``max_retries``
+    times with exponential backoff (``backoff``, 2 * ``backoff``, ...). ``fetch`` is called as
+    fetch(tickers, start_date, end_date) and may be a plain function (run in a worker thread) or a
+    coroutine function; it defaults to Yahoo Finance and can be swapped for a local stand-in in tests.
+
+    The event loop runs in its own daemon thread, so the blocking API also works inside notebooks
+    that already have a running loop, and prefetch() can download the next window while the caller
+    is busy backtesting the current one.
+    """
+
+    def __init__(self, fetch: Optional[Callable[..., Any]] = None, batch_size: int = 50, max_concurrency: int = 4,
+                 max_retries: int = 3, backoff: float = 1.0, timeout: Optional[float] = 120.0):
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be at least 1")
+        self.fetch = fetch if fetch is not None else yahoo_fetch
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def get_historical_data(self, tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+        return self.prefetch(tickers, start_date, end_date).result()
+
+    def prefetch(self, tickers: List[str], start_date: str, end_date: str) -> concurrent.futures.Future:
+        """Start fetching in the background and return a Future resolving to the price DataFrame."""
+        return asyncio.run_coroutine_threadsafe(self.get_historical_data_async(tickers, start_date, end_date), self._get_loop())
+
+    async def get_historical_data_async(self, tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+        """Fetch all batches concurrently and join them into one DataFrame with tickers as columns."""
+        tickers = list(tickers)
+        if not tickers:
+            return pd.DataFrame()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+        frames = await asyncio.gather(*(self._fetch_batch(batch, start_date, end_date, semaphore) for batch in batches))
+        result = pd.concat(frames, axis=1).sort_index()
+        return result[[ticker for ticker in tickers if ticker in result.columns]]
+
+    def iter_windows(self, tickers: List[str], windows: List[Tuple[str, str]]) -> Iterator[pd.DataFrame]:
+        """Yield prices for each (start_date, end_date) window, fetching the next window in the background."""
+        return self._iter_prefetched([(tickers, start_date, end_date) for start_date, end_date in windows])
+
+    def iter_ticker_batches(self, tickers: List[str], start_date: str, end_date: str, batch_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Yield prices for successive ticker batches, fetching the next batch in the background."""
+        batch_size = batch_size or self.batch_size
+        return self._iter_prefetched([(tickers[i:i + batch_size], start_date, end_date) for i in range(0, len(tickers), batch_size)])
+
+    def close(self) -> None:
+        """Stop the background event loop."""
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _iter_prefetched(self, requests: List[Tuple[List[str], str, str]]) -> Iterator[pd.DataFrame]:
+        pending = self.prefetch(*requests[0]) if requests else None
+        for i in range(len(requests)):
+            current = pending
+            pending = self.prefetch(*requests[i + 1]) if i + 1 < len(requests) else None
+            try:
+                yield current.result()
+            except GeneratorExit:
+                if pending is not None:
+                    pending.cancel()
+                raise
+
+    async def _fetch_batch(self, batch: List[str], start_date: str, end_date: str, semaphore: asyncio.Semaphore) -> pd.DataFrame:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._call_fetch(batch, start_date, end_date, semaphore)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                print(f"Warning: fetch of {len(batch)} tickers failed ({e!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _call_fetch(self, batch: List[str], start_date: str, end_date: str, semaphore: asyncio.Semaphore) -> pd.DataFrame:
+        """One attempt, holding a ``semaphore`` slot until the fetch has really finished."""
+        await semaphore.acquire()
+        if inspect.iscoroutinefunction(self.fetch):
+            try:
+                return await asyncio.wait_for(self.fetch(batch, start_date, end_date), self.timeout)
+            finally:
+                semaphore.release()
+
+        # A timed-out thread keeps running until the blocking call returns, so the slot is released
+        # from the thread's completion rather than when the wait is abandoned
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(self.fetch, batch, start_date, end_date)
+        except Exception:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: _release_threadsafe(loop, semaphore))
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="AsyncDataSourceFetch")
+            return self._executor
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="AsyncDataSourceLoop", daemon=True)
+                self._thread.start()
+            return self._loop
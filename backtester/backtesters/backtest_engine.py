@@ -6,8 +6,10 @@ from typing import List, Dict, Any
 class BacktestEngine(ABC):
     """Interface for backtesting a trading strategy."""
     
-    def __init__(self, initial_cash: float):
+    def __init__(self, initial_cash: float, compact: bool = False):
         self.initial_cash = initial_cash
+        # Return the holdings ledger with integer share counts (see backtester/compact_panel.py)
+        self.compact = compact
     
     @abstractmethod
     def run_backtest(self, orders: List[Dict[str, Any]], data: pd.DataFrame) -> Dict[str, Any]:
@@ -0,0 +1,27 @@
+import os
+import pickle
+import zlib
+from typing import Dict, Any, Optional
+
+CHECKPOINT_HEADER = b'BTCKPT1\n'
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomically write ``state`` as a compressed pickle, replacing any previous checkpoint at ``path``."""
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(CHECKPOINT_HEADER)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Read a checkpoint written by save_checkpoint, or None if there is none at ``path``."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        header = f.read(len(CHECKPOINT_HEADER))
+        if header != CHECKPOINT_HEADER:
+            raise ValueError(f"{path} is not a backtest checkpoint")
+        return pickle.loads(zlib.decompress(f.read()))
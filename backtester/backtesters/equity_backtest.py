@@ -1,13 +1,33 @@
+import hashlib
+import os
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from .backtest_engine import BacktestEngine
+from .checkpoint import save_checkpoint, load_checkpoint
+from ..compact_panel import compact_holdings
 
 class EquityBacktestEngine(BacktestEngine):
-    """Equities (long/short) backtest engine implementation without slippage or transaction costs."""
+    """
+    Equities (long/short) backtest engine implementation without slippage or transaction costs.
 
-    def run_backtest(self, orders: List[Dict[str, Any]], data: pd.DataFrame) -> Dict[str, Any]:
+    With ``checkpoint_path`` set, the loop state (cash, holdings, order cursor and the partial value and
+    holdings ledgers) is written to that file every ``checkpoint_interval`` trading days. A later call
+    to run_backtest with the same orders and data resumes from it and returns the same results as an
+    uninterrupted run. The checkpoint is deleted once a run completes.
+
+    Prices may be float32 (compact panels); cash and portfolio values are always accumulated in float64.
+    """
+
+    def __init__(self, initial_cash: float, checkpoint_path: Optional[str] = None, checkpoint_interval: int = 250, compact: bool = False):
+        super().__init__(initial_cash, compact)
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+
+    def run_backtest(self, orders: List[Dict[str, Any]], data: pd.DataFrame, resume: bool = True) -> Dict[str, Any]:
         cash = self.initial_cash
         holdings = {}
         portfolio_values = []
@@ -15,66 +35,43 @@ class EquityBacktestEngine(BacktestEngine):
         all_dates = data.index.sort_values()
         order_index = 0
         num_orders = len(orders)
+        start_index = 0
+
+        # Hashing every order and price is only worth it when checkpoints are written or resumed
+        run_signature = self._run_signature(orders, data) if self.checkpoint_path else None
+        checkpoint = load_checkpoint(self.checkpoint_path) if self.checkpoint_path and resume else None
+        if checkpoint is not None:
+            if checkpoint["run_signature"] != run_signature:
+                raise ValueError(f"Checkpoint {self.checkpoint_path} was written for different orders, data or initial cash")
+            cash = checkpoint["cash"]
+            holdings = checkpoint["holdings"]
+            order_index = checkpoint["order_index"]
+            portfolio_values = checkpoint["portfolio_values"]
+            daily_holdings_and_cash_list = checkpoint["daily_holdings_and_cash_list"]
+            start_index = checkpoint["next_date_index"]
+            print(f"Resuming backtest from checkpoint at {all_dates[start_index - 1]}")
 
         last_month = None
-        for current_date in all_dates:
+        for date_index in range(start_index, len(all_dates)):
+            current_date = all_dates[date_index]
             # Calculate current portfolio value at the start of the day (using today's prices) for sizing
             current_holdings_value = 0
             for h_ticker, h_quantity in holdings.items():
                 if h_ticker in data.columns:
-                    current_holdings_value += h_quantity * data.at[current_date, h_ticker]
+                    current_holdings_value += h_quantity * float(data.at[current_date, h_ticker])
             current_portfolio_value = cash + current_holdings_value
 
             while order_index < num_orders and orders[order_index]['date'] == current_date:
                 order = orders[order_index]
-                ticker = order["ticker"]
-                raw_quantity = order["quantity"]
-                price = data.at[current_date, ticker]
-                
-                quantity = 0
-                
-                if order["type"] == "BUY":
-                    # Dynamic sizing: 0 < quantity <= 1.0 implies percentage of portfolio value
-                    if isinstance(raw_quantity, float) and 0 < raw_quantity <= 1.0:
-                        target_value = current_portfolio_value * raw_quantity
-                        quantity = int(target_value // price)
-                    else:
-                        quantity = raw_quantity
-                        
-                    cost = price * quantity
-                    if cash >= cost: # Ensure we have enough cash
-                        cash -= cost
-                        holdings[ticker] = holdings.get(ticker, 0) + quantity
-                    else:
-                        # Optional: Buy as much as possible? For now, skip or partial fill could be implemented.
-                        # Implementing partial fill to utilize remaining cash if dynamic sizing slightly overshot due to gaps
-                        # actually for this simple engine, if fixed size fails, we skip. 
-                        # if dynamic sizing, it calculates based on PV, but checking vs cash is safest.
-                        pass
-
-                elif order["type"] == "SELL":
-                    # Dynamic sizing: 0 < quantity <= 1.0 implies percentage of CURRENT HOLDINGS
-                    if isinstance(raw_quantity, float) and 0 < raw_quantity <= 1.0:
-                        current_holding = holdings.get(ticker, 0)
-                        quantity = int(current_holding * raw_quantity)
-                    else:
-                        quantity = raw_quantity
-                    
-                    # Ensure we don't sell more than we have (unless shorting is supported, assuming long-only logic here for safety or capped at 0)
-                    available = holdings.get(ticker, 0)
-                    quantity = min(quantity, available)
-                    
-                    proceeds = price * quantity
-                    cash += proceeds
-                    holdings[ticker] = holdings.get(ticker, 0) - quantity
-
+                price = float(data.at[current_date, order["ticker"]])
+                cash = self._execute_order(order, price, cash, holdings, current_portfolio_value)
                 order_index += 1
 
             # Recalculate Total Value after trades
             total_value = cash
             current_day_holdings = {"Date": current_date, "Cash": cash}
             for h_ticker, h_quantity in holdings.items():
-                price = data.at[current_date, h_ticker]
+                price = float(data.at[current_date, h_ticker])
                 position_value = price * h_quantity
                 total_value += position_value
                 current_day_holdings[h_ticker] = h_quantity
@@ -83,6 +80,81 @@ class EquityBacktestEngine(BacktestEngine):
             portfolio_values.append((current_date, total_value))
             # print(f"{current_date}: Portfolio Value - {total_value:.2f}") # Debug print portfolio each day
 
+            if self.checkpoint_path and (date_index + 1) % self.checkpoint_interval == 0 and date_index + 1 < len(all_dates):
+                save_checkpoint(self.checkpoint_path, {
+                    "run_signature": run_signature,
+                    "next_date_index": date_index + 1,
+                    "cash": cash,
+                    "holdings": holdings,
+                    "order_index": order_index,
+                    "portfolio_values": portfolio_values,
+                    "daily_holdings_and_cash_list": daily_holdings_and_cash_list,
+                })
+
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
         portfolio_values_df = pd.DataFrame(portfolio_values, columns=["Date", "Portfolio Value"]).set_index("Date")
         daily_holdings_and_cash_df = pd.DataFrame(daily_holdings_and_cash_list).set_index("Date").fillna(0)
-        return {"portfolio_values": portfolio_values_df, "daily_holdings_and_cash": daily_holdings_and_cash_df}
\ No newline at end of file
+        if self.compact:
+            daily_holdings_and_cash_df = compact_holdings(daily_holdings_and_cash_df)
+        return {"portfolio_values": portfolio_values_df, "daily_holdings_and_cash": daily_holdings_and_cash_df}
+
+    def _run_signature(self, orders: List[Dict[str, Any]], data: pd.DataFrame) -> tuple:
+        """
+        Identity of a run, used to refuse resuming from another run's checkpoint: initial cash plus
+        content hashes of the orders (date, ticker, type, quantity) and of the price data.
+        """
+        order_fields = pd.DataFrame(
+            [(order["date"], order["ticker"], order["type"], order["quantity"]) for order in orders],
+            columns=["date", "ticker", "type", "quantity"],
+        )
+        # Object columns hash by str(), so an int quantity and the float sizing fraction 1.0 differ
+        orders_digest = hashlib.sha256(pd.util.hash_pandas_object(order_fields.astype(object), index=False).to_numpy().tobytes()).hexdigest()
+        data_hash = hashlib.sha256(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        data_hash.update(repr(list(data.columns)).encode())
+        return (self.initial_cash, len(orders), orders_digest, data_hash.hexdigest())
+
+    def _execute_order(self, order: Dict[str, Any], price: float, cash: float, holdings: Dict[str, float], current_portfolio_value: float) -> float:
+        """Apply a single order to ``holdings`` at ``price`` and return the updated cash balance."""
+        ticker = order["ticker"]
+        raw_quantity = order["quantity"]
+
+        quantity = 0
+
+        if order["type"] == "BUY":
+            # Dynamic sizing: 0 < quantity <= 1.0 implies percentage of portfolio value
+            if isinstance(raw_quantity, float) and 0 < raw_quantity <= 1.0:
+                target_value = current_portfolio_value * raw_quantity
+                quantity = int(target_value // price)
+            else:
+                quantity = raw_quantity
+
+            cost = price * quantity
+            if cash >= cost: # Ensure we have enough cash
+                cash -= cost
+                holdings[ticker] = holdings.get(ticker, 0) + quantity
+            else:
+                # Optional: Buy as much as possible? For now, skip or partial fill could be implemented.
+                # Implementing partial fill to utilize remaining cash if dynamic sizing slightly overshot due to gaps
+                # actually for this simple engine, if fixed size fails, we skip. 
+                # if dynamic sizing, it calculates based on PV, but checking vs cash is safest.
+                pass
+
+        elif order["type"] == "SELL":
+            # Dynamic sizing: 0 < quantity <= 1.0 implies percentage of CURRENT HOLDINGS
+            if isinstance(raw_quantity, float) and 0 < raw_quantity <= 1.0:
+                current_holding = holdings.get(ticker, 0)
+                quantity = int(current_holding * raw_quantity)
+            else:
+                quantity = raw_quantity
+
+            # Ensure we don't sell more than we have (unless shorting is supported, assuming long-only logic here for safety or capped at 0)
+            available = holdings.get(ticker, 0)
+            quantity = min(quantity, available)
+
+            proceeds = price * quantity
+            cash += proceeds
+            holdings[ticker] = holdings.get(ticker, 0) - quantity
+
+        return cash
\ No newline at end of file
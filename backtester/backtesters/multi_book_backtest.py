@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any, Tuple, Optional
+
+from .equity_backtest import EquityBacktestEngine
+from ..compact_panel import compact_holdings
+
+class MultiBookBacktestEngine(EquityBacktestEngine):
+    """
+    Shared-scan variant of EquityBacktestEngine that advances several order books together.
+
+    Each book is a (name, orders) pair with its own cash and holdings. All books are revalued
+    against the same row of one price matrix per date, so comparing K strategies costs roughly
+    one pass over the data instead of K. Sizing and execution rules are those of EquityBacktestEngine,
+    and each book's result is identical to running it through EquityBacktestEngine on its own.
+    Checkpointing is not supported.
+    """
+
+    def __init__(self, initial_cash: float, checkpoint_path: Optional[str] = None, checkpoint_interval: int = 250, compact: bool = False):
+        if checkpoint_path is not None:
+            raise ValueError(f"{type(self).__name__} does not support checkpoint_path")
+        super().__init__(initial_cash, checkpoint_interval=checkpoint_interval, compact=compact)
+
+    def run_backtest(self, orders: List[Dict[str, Any]], data: pd.DataFrame) -> Dict[str, Any]:
+        return self.run_backtests([("orders", orders)], data)["orders"]
+
+    def run_backtests(self, books: List[Tuple[str, List[Dict[str, Any]]]], data: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """
+        Args:
+            books: List of (name, orders) pairs, orders sorted by date as for run_backtest
+            data: Price data DataFrame shared by every book
+
+        Returns:
+            Dict of book name -> {'portfolio_values': DataFrame, 'daily_holdings_and_cash': DataFrame}
+        """
+        names = [name for name, _ in books]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Book names must be unique, got {names}")
+
+        all_dates = data.index.sort_values()
+        prices = data.loc[all_dates].to_numpy()
+        column_index = {ticker: i for i, ticker in enumerate(data.columns)}
+
+        states = []
+        for name, orders in books:
+            states.append({
+                "name": name,
+                "orders": orders,
+                "num_orders": len(orders),
+                "order_index": 0,
+                "cash": self.initial_cash,
+                "holdings": {},
+                "portfolio_values": [],
+                "daily_holdings_and_cash_list": [],
+            })
+
+        for i, current_date in enumerate(all_dates):
+            # The matrix keeps the panel's dtype (float32 for compact panels); accounting is float64
+            row = prices[i].astype(np.float64, copy=False)
+            for state in states:
+                holdings = state["holdings"]
+                cash = state["cash"]
+
+                # Calculate current portfolio value at the start of the day (using today's prices) for sizing
+                current_holdings_value = 0
+                for h_ticker, h_quantity in holdings.items():
+                    if h_ticker in column_index:
+                        current_holdings_value += h_quantity * row[column_index[h_ticker]]
+                current_portfolio_value = cash + current_holdings_value
+
+                orders = state["orders"]
+                order_index = state["order_index"]
+                while order_index < state["num_orders"] and orders[order_index]['date'] == current_date:
+                    order = orders[order_index]
+                    price = row[column_index[order["ticker"]]]
+                    cash = self._execute_order(order, price, cash, holdings, current_portfolio_value)
+                    order_index += 1
+                state["order_index"] = order_index
+                state["cash"] = cash
+
+                # Recalculate Total Value after trades
+                total_value = cash
+                current_day_holdings = {"Date": current_date, "Cash": cash}
+                for h_ticker, h_quantity in holdings.items():
+                    total_value += row[column_index[h_ticker]] * h_quantity
+                    current_day_holdings[h_ticker] = h_quantity
+
+                state["daily_holdings_and_cash_list"].append(current_day_holdings)
+                state["portfolio_values"].append((current_date, total_value))
+
+        results = {}
+        for state in states:
+            portfolio_values_df = pd.DataFrame(state["portfolio_values"], columns=["Date", "Portfolio Value"]).set_index("Date")
+            daily_holdings_and_cash_df = pd.DataFrame(state["daily_holdings_and_cash_list"]).set_index("Date").fillna(0)
+            if self.compact:
+                daily_holdings_and_cash_df = compact_holdings(daily_holdings_and_cash_df)
+            results[state["name"]] = {"portfolio_values": portfolio_values_df, "daily_holdings_and_cash": daily_holdings_and_cash_df}
+        return results
@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any
+
+from .backtest_engine import BacktestEngine
+from ..compact_panel import compact_holdings
+
+class TargetWeightBacktestEngine(BacktestEngine):
+    """
+    Long/short engine that rebalances to target weights instead of executing individual orders,
+    without slippage or transaction costs.
+
+    Takes a rebalance-date x ticker DataFrame of target weights (fractions of portfolio value, negative
+    for shorts; a missing or NaN weight in a rebalance row means flat), e.g. from
+    TargetWeightGenerator.generate_target_weights. On each rebalance date the whole book is diffed
+    against current positions in one vectorized step:
+
+        target_shares = trunc(weight * portfolio_value / price)
+        trades = target_shares - current_shares
+
+    where portfolio_value is cash plus positions at that day's prices. Rebalance dates that are not
+    trading days apply on the next trading day. Tickers without a price on a rebalance date keep their
+    current position. Positions are valued at the last known price.
+    """
+
+    def run_backtest(self, target_weights: pd.DataFrame, data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Args:
+            target_weights: Rebalance-date x ticker DataFrame of target weights
+            data: Price data DataFrame
+
+        Returns:
+            Dict with 'portfolio_values', 'daily_holdings_and_cash' (as EquityBacktestEngine) and
+            'trades' (rebalance date x ticker share changes)
+        """
+        all_dates = data.index.sort_values()
+        data = data.loc[all_dates]
+        # Price matrices stay float32 for compact panels; rows are widened to float64 for accounting
+        price_dtype = np.float32 if len(data.columns) and (data.dtypes == np.float32).all() else np.float64
+        prices = data.to_numpy(dtype=price_dtype)
+        valuation_prices = data.ffill().to_numpy(dtype=price_dtype)
+
+        unknown_tickers = [ticker for ticker in target_weights.columns if ticker not in data.columns]
+        if unknown_tickers:
+            print(f"Warning: No price data for {unknown_tickers}, their target weights are ignored.")
+        target_weights = target_weights.set_axis(pd.DatetimeIndex(target_weights.index)).sort_index().reindex(columns=data.columns)
+
+        # Map each rebalance date to the first trading day on or after it; later rows win on collisions
+        rebalance_rows = all_dates.searchsorted(target_weights.index, side='left')
+        in_range = rebalance_rows < len(all_dates)
+        weights = pd.DataFrame(target_weights.to_numpy(dtype=np.float64)[in_range], index=rebalance_rows[in_range])
+        weights = weights[~weights.index.duplicated(keep='last')].fillna(0.0)
+
+        num_dates, num_tickers = prices.shape
+        positions = np.zeros(num_tickers)
+        cash = float(self.initial_cash)
+        position_path = np.zeros((num_dates, num_tickers))
+        cash_path = np.empty(num_dates)
+        trade_rows = []
+
+        segment_start = 0
+        for row, row_weights in zip(weights.index, weights.to_numpy()):
+            position_path[segment_start:row] = positions
+            cash_path[segment_start:row] = cash
+
+            portfolio_value = cash + np.nansum(positions * valuation_prices[row].astype(np.float64))
+            price = prices[row].astype(np.float64)
+            tradable = np.isfinite(price) & (price > 0)
+            safe_price = np.where(tradable, price, 1.0)
+            target = np.where(tradable, np.trunc(row_weights * portfolio_value / safe_price), positions)
+            trades = target - positions
+            cash -= float(np.dot(trades, np.where(tradable, price, 0.0)))
+            positions = target
+
+            trade_rows.append((all_dates[row], trades))
+            segment_start = row
+        position_path[segment_start:] = positions
+        cash_path[segment_start:] = cash
+
+        held_value = np.where(position_path != 0, position_path * valuation_prices, 0.0)
+        portfolio_values_df = pd.DataFrame({"Portfolio Value": cash_path + held_value.sum(axis=1)}, index=all_dates)
+        portfolio_values_df.index.name = "Date"
+
+        ever_held = (position_path != 0).any(axis=0)
+        daily_holdings_and_cash_df = pd.DataFrame(position_path[:, ever_held], index=all_dates, columns=data.columns[ever_held])
+        daily_holdings_and_cash_df.insert(0, "Cash", cash_path)
+        daily_holdings_and_cash_df.index.name = "Date"
+        if self.compact:
+            daily_holdings_and_cash_df = compact_holdings(daily_holdings_and_cash_df)
+
+        trades_df = pd.DataFrame([trades for _, trades in trade_rows], index=pd.DatetimeIndex([date for date, _ in trade_rows], name="Date"), columns=data.columns)
+        trades_df = trades_df.loc[:, (trades_df != 0).any(axis=0)]
+        return {"portfolio_values": portfolio_values_df, "daily_holdings_and_cash": daily_holdings_and_cash_df, "trades": trades_df}
@@ -2,8 +2,13 @@ import pandas as pd
 import yfinance as yf
 import pickle
 import requests
+import os
+import sys
 from io import StringIO
 
+# Optional date,ticker,action file of historical S&P 500 changes (see backtester/index_membership.py)
+MEMBERSHIP_FILE = 'sp500_membership.csv'
+
 def fetch_sp500_tickers():
     url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
@@ -46,14 +51,23 @@ def save_data(data, filename):
     with open(filename, 'wb') as f:
         pickle.dump(data, f)
 
-def main():
+def main(compact=False):
     tickers = fetch_sp500_tickers()
+    if os.path.exists(MEMBERSHIP_FILE):
+        # Also cache former constituents so point-in-time backtests are free of survivorship bias
+        # Same '.' -> '-' rewrite as above (and as IndexMembership.from_events) so e.g. BRK.B is fetched once as BRK-B
+        historical_tickers = pd.read_csv(MEMBERSHIP_FILE)['ticker'].astype(str).str.strip().str.replace('.', '-', regex=False).unique().tolist()
+        tickers += [ticker for ticker in historical_tickers if ticker not in tickers]
     start_date = '2010-01-01'
     end_date = '2024-11-20'
     data = download_data(tickers, start_date, end_date)
     vwap_data = calculate_vwap(data)
+    if compact:
+        from backtester.compact_panel import compact_cache # run as python -m backtester.cache_sp500_data --compact
+        # float32 prices and integer volumes, about half the size on disk and in memory
+        vwap_data = compact_cache(vwap_data)
     save_data(vwap_data, 'sp500_data.pkl')
     print("Data has been cached and saved to sp500_data.pkl")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(compact='--compact' in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Command-line runner: backtest a strategy described by a JSON config file.
+
+Usage:
+    python -m backtester.cli configs/mean_reversion.json [--plot] [--save-plot PATH]
+
+Config keys (classes are dotted import paths, resolved only when the run needs them):
+    data_source  {"class": ..., "params": {...}}
+    tickers, start_date, end_date
+    strategy     {"class": ..., "params": {...}}
+    engine       {"class": ..., "params": {...}}          (default EquityBacktestEngine, initial_cash 100000)
+    metrics      {"class": ..., "params": {...}, "benchmark": "SPY", "plot": false, "save_path": null}
+    net_orders   true to pass orders through backtester.order_netting.net_orders (default false)
+
+For compact-precision runs set "compact": true in both data_source.params and engine.params
+(see backtester/compact_panel.py); the ledger is then keyed by the data source's ticker codes.
+"""
+import argparse
+import importlib
+import json
+from typing import Dict, Any, List, Optional
+
+from backtester.backtesters.target_weight_backtest import TargetWeightBacktestEngine
+from backtester.order_netting import net_orders
+from strategies.order_generator import TargetWeightGenerator
+
+DEFAULT_ENGINE = {"class": "backtester.backtesters.equity_backtest.EquityBacktestEngine", "params": {"initial_cash": 100000}}
+DEFAULT_METRICS = {"class": "backtester.metrics.ExtendedMetrics", "params": {}, "benchmark": "SPY", "plot": False, "save_path": None}
+
+def load_config(path: str) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        config = json.load(f)
+    for key in ("data_source", "tickers", "start_date", "end_date", "strategy"):
+        if key not in config:
+            raise ValueError(f"Config {path} is missing required key '{key}'")
+    return config
+
+def resolve_class(dotted_path: str) -> type:
+    """Import 'package.module.ClassName' and return the class."""
+    module_name, _, class_name = dotted_path.rpartition('.')
+    if not module_name:
+        raise ValueError(f"Expected a dotted path like 'package.module.ClassName', got '{dotted_path}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def build(spec: Dict[str, Any]) -> Any:
+    """Instantiate {"class": dotted_path, "params": {...}}."""
+    return resolve_class(spec["class"])(**spec.get("params", {}))
+
+def run_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the backtest described by ``config``.
+
+    Returns:
+        Dict with 'portfolio_values', 'daily_holdings_and_cash', 'returns', 'benchmark_returns' and 'metrics'
+    """
+    metrics_spec = {**DEFAULT_METRICS, **config.get("metrics", {})}
+    tickers = config["tickers"]
+    start_date, end_date = config["start_date"], config["end_date"]
+
+    data_source = build(config["data_source"])
+    benchmark = metrics_spec.get("benchmark")
+    # Data sources that can prefetch fetch the benchmark while the backtest runs
+    benchmark_future = data_source.prefetch([benchmark], start_date, end_date) if benchmark and hasattr(data_source, "prefetch") else None
+
+    data = data_source.get_historical_data(tickers, start_date, end_date)
+    if data.empty:
+        raise ValueError(f"No data could be fetched for {tickers} between {start_date} and {end_date}")
+
+    order_generator = build(config["strategy"])
+    backtest_engine = build(config.get("engine", DEFAULT_ENGINE))
+    metrics_calculator = build(metrics_spec)
+
+    if isinstance(backtest_engine, TargetWeightBacktestEngine):
+        if not isinstance(order_generator, TargetWeightGenerator):
+            raise ValueError(f"{type(backtest_engine).__name__} needs a strategy implementing TargetWeightGenerator")
+        orders = order_generator.generate_target_weights(data)
+        if orders.empty:
+            print("Warning: No target weights were generated. Check strategy parameters or data.")
+    elif config.get("net_orders", False):
+        netting = net_orders(order_generator.generate_orders(data))
+        orders = netting["orders"]
+        print(f"Order netting: {netting['orders_in']} -> {netting['orders_out']} orders ({netting['eliminated']} eliminated)")
+    else:
+        # Engines consume orders in date order; strategies emit them ticker by ticker
+        orders = sorted(order_generator.generate_orders(data), key=lambda order: order["date"])
+        if not orders:
+            print("Warning: No orders were generated. Check strategy parameters or data.")
+
+    backtest_results = backtest_engine.run_backtest(orders, data)
+    portfolio_values = backtest_results["portfolio_values"]["Portfolio Value"]
+    daily_holdings_and_cash = backtest_results.get("daily_holdings_and_cash")
+    returns = portfolio_values.pct_change().dropna()
+
+    benchmark_returns = None
+    if benchmark:
+        benchmark_data = benchmark_future.result() if benchmark_future is not None else data_source.get_historical_data([benchmark], start_date, end_date)
+        if getattr(data_source, "ticker_codes", None) is not None:
+            benchmark_data = data_source.ticker_codes.decode_frame(benchmark_data)
+        if benchmark_data.empty or benchmark not in benchmark_data.columns:
+            print("Warning: Could not fetch benchmark data.")
+        else:
+            benchmark_returns = benchmark_data[benchmark].pct_change().dropna()
+
+    metrics = metrics_calculator.calculate(portfolio_values, returns, benchmark_returns, data, daily_holdings_and_cash)
+    return {
+        "portfolio_values": portfolio_values,
+        "daily_holdings_and_cash": daily_holdings_and_cash,
+        "returns": returns,
+        "benchmark_returns": benchmark_returns,
+        "metrics": metrics,
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a backtest from a JSON config file.")
+    parser.add_argument("config", help="Path to the JSON config file")
+    parser.add_argument("--plot", action="store_true", help="Plot cumulative returns (overrides metrics.plot)")
+    parser.add_argument("--save-plot", default=None, help="Save the returns plot to this path")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    results = run_config(config)
+
+    # Note: all values are annualized and assume 252 trading days in a year
+    # Note: all returns are in fractional format. For example, 0.01 is 1% return
+    print("###\nBacktest Metrics:")
+    for metric, value in results["metrics"].items():
+        print(f" -> {metric}: {value:.2f}")
+
+    metrics_spec = {**DEFAULT_METRICS, **config.get("metrics", {})}
+    save_path = args.save_plot or metrics_spec.get("save_path")
+    if args.plot or metrics_spec.get("plot") or save_path:
+        title = config.get("title", f"{config['strategy']['class'].rpartition('.')[2]} vs Benchmark")
+        build(metrics_spec).plot_returns(results["returns"], results["benchmark_returns"], title=title, save_path=save_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compact-precision representation of price panels and holdings ledgers.
+
+Opt-in via PickleDataSource(..., compact=True) and the engines' ``compact`` flag:
+    prices   float32 instead of float64 (about 7 significant digits, 1e-7 relative rounding)
+    volumes  int32 (int64 if a value does not fit), missing volume stored as 0
+    tickers  integer column codes, with a TickerCodes side dictionary to map them back
+    ledger   share counts as int32 (float32 if any position is fractional), Cash stays float64
+
+Engines keep cash and portfolio accounting in float64 and only read prices from the compact panel.
+Strategies see float32 prices, so a signal that compares two nearly equal prices (e.g. a price
+against its moving average) can occasionally flip; compare_metrics() reports how far ExtendedMetrics
+results move, see guide.md for measured differences.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Iterable, Any, Optional, Tuple
+
+PRICE_DTYPE = np.float32
+
+class TickerCodes:
+    """Side dictionary between ticker strings and the integer codes used as column labels."""
+
+    def __init__(self, tickers: Iterable[str]):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.codes = {ticker: code for code, ticker in enumerate(self.tickers)}
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def encode(self, tickers: Iterable[str]) -> List[int]:
+        return [self.codes[ticker] for ticker in tickers]
+
+    def decode(self, codes: Iterable[Any]) -> List[Any]:
+        """Map codes back to tickers; labels that are not codes (e.g. 'Cash') are left as they are."""
+        return [self.tickers[code] if isinstance(code, (int, np.integer)) and 0 <= code < len(self.tickers) else code for code in codes]
+
+    def encode_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.set_axis(self.encode(df.columns), axis=1)
+
+    def decode_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.set_axis(self.decode(df.columns), axis=1)
+
+def compact_prices(data: pd.DataFrame, ticker_codes: Optional[TickerCodes] = None) -> Tuple[pd.DataFrame, TickerCodes]:
+    """Return a float32 copy of a dates x tickers panel with integer ticker codes as columns."""
+    ticker_codes = ticker_codes if ticker_codes is not None else TickerCodes(data.columns)
+    compact = data.astype(PRICE_DTYPE)
+    return ticker_codes.encode_frame(compact), ticker_codes
+
+def compact_volume(volume: pd.Series) -> pd.Series:
+    """Whole-share volume as int32, or int64 if a value does not fit; missing values become 0."""
+    filled = volume.fillna(0)
+    dtype = np.int32 if filled.abs().max() <= np.iinfo(np.int32).max else np.int64
+    return filled.round().astype(dtype)
+
+def compact_cache(cache: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Compact a cache_sp500_data.py cache ({ticker: DataFrame of Adj Close, Volume, VWAP})."""
+    result = {}
+    for ticker, ticker_df in cache.items():
+        compact = ticker_df.copy()
+        for column in compact.columns:
+            if column == 'Volume':
+                compact[column] = compact_volume(compact[column])
+            elif pd.api.types.is_float_dtype(compact[column]):
+                compact[column] = compact[column].astype(PRICE_DTYPE)
+        result[ticker] = compact
+    return result
+
+def compact_holdings(daily_holdings_and_cash: pd.DataFrame) -> pd.DataFrame:
+    """Holdings ledger with int32 share counts (float32 if any are fractional) and float64 Cash."""
+    positions = daily_holdings_and_cash.drop(columns=['Cash'], errors='ignore')
+    values = positions.to_numpy(dtype=np.float64)
+    whole = np.array_equal(values, np.round(values)) and (values.size == 0 or np.abs(values).max() <= np.iinfo(np.int32).max)
+    result = positions.astype(np.int32 if whole else np.float32)
+    if 'Cash' in daily_holdings_and_cash.columns:
+        result.insert(0, 'Cash', daily_holdings_and_cash['Cash'].astype(np.float64))
+    return result
+
+def compare_metrics(full_precision: Dict[str, float], compact: Dict[str, float]) -> pd.DataFrame:
+    """Absolute and relative differences between two ExtendedMetrics results."""
+    rows = []
+    for metric, expected in full_precision.items():
+        actual = compact.get(metric, np.nan)
+        difference = abs(actual - expected)
+        relative = difference / abs(expected) if expected != 0 else difference
+        rows.append({"metric": metric, "float64": expected, "compact": actual, "abs_diff": difference, "rel_diff": relative})
+    return pd.DataFrame(rows).set_index("metric")
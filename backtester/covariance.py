@@ -0,0 +1,174 @@
+import math
+from collections import OrderedDict
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Optional, Iterable, Iterator, Tuple
+
+class CovarianceService:
+    """
+    Ticker x ticker covariance of a returns panel at any date, updated incrementally day by day.
+
+    Estimators (each new day costs O(N^2) instead of a full pandas cov over the window):
+        'rolling': sample covariance of the last ``window`` days, matches returns.rolling(window).cov()
+        'ewma':    exponentially weighted covariance with decay ``alpha`` (or ``halflife`` days),
+                   matches returns.ewm(alpha=alpha, adjust=False).cov(bias=True)
+
+    Missing returns are treated as 0; tickers with fewer than ``min_periods`` observed returns in the
+    estimation window (rolling) or overall (ewma) are reported as NaN. ``shrinkage`` in [0, 1] pulls
+    covariances toward zero while keeping variances: (1 - shrinkage) * cov + shrinkage * diag(cov).
+
+    Estimator state is snapshotted per requested date in an LRU cache of at most ``max_snapshots``
+    entries. Walking dates forward reuses the latest state, and earlier dates resume from the nearest
+    cached snapshot instead of recomputing from the first row.
+    """
+
+    def __init__(self, returns: pd.DataFrame, method: str = 'ewma', window: int = 60, alpha: Optional[float] = None,
+                 halflife: Optional[float] = None, min_periods: Optional[int] = None, shrinkage: float = 0.0, max_snapshots: int = 32):
+        if method not in ('rolling', 'ewma'):
+            raise ValueError(f"Unknown covariance method '{method}', expected 'rolling' or 'ewma'")
+        if not 0.0 <= shrinkage <= 1.0:
+            raise ValueError("shrinkage must be between 0 and 1")
+        if method == 'ewma':
+            if alpha is None:
+                alpha = 1 - math.exp(math.log(0.5) / (halflife if halflife is not None else window / 2))
+            if not 0 < alpha <= 1:
+                raise ValueError("alpha must be in (0, 1]")
+
+        returns = returns.sort_index()
+        self.dates = returns.index
+        self.tickers = returns.columns
+        self.observed = returns.notna().to_numpy()
+        self.values = returns.to_numpy(dtype=np.float64, na_value=0.0)
+        self.method = method
+        self.window = window
+        self.alpha = alpha
+        self.min_periods = min_periods if min_periods is not None else (window if method == 'rolling' else 1)
+        self.shrinkage = shrinkage
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+        self._state = self._initial_state()
+
+    def covariance(self, date) -> pd.DataFrame:
+        return pd.DataFrame(self._covariance_matrix(self._row(date)), index=self.tickers, columns=self.tickers)
+
+    def volatilities(self, date, annualize: bool = True) -> pd.Series:
+        return self.snapshot(date, annualize=annualize)["volatilities"]
+
+    def correlations(self, date) -> pd.DataFrame:
+        return self.snapshot(date)["correlations"]
+
+    def betas(self, date, market: str = 'SPY') -> pd.Series:
+        return self.snapshot(date, market=market)["betas"]
+
+    def snapshot(self, date, market: Optional[str] = None, annualize: bool = True) -> Dict[str, Any]:
+        """
+        Covariance plus volatilities, correlations and (if ``market`` is given) betas to ``market``,
+        all derived from one covariance matrix.
+        """
+        cov = self._covariance_matrix(self._row(date))
+        variances = np.diag(cov)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(variances)
+            correlations = cov / np.outer(std, std)
+            result = {
+                "date": self.dates[self._row(date)],
+                "covariance": pd.DataFrame(cov, index=self.tickers, columns=self.tickers),
+                "volatilities": pd.Series(std * (np.sqrt(252) if annualize else 1.0), index=self.tickers),
+                "correlations": pd.DataFrame(correlations, index=self.tickers, columns=self.tickers),
+            }
+            if market is not None:
+                market_index = self.tickers.get_loc(market)
+                result["betas"] = pd.Series(cov[:, market_index] / variances[market_index], index=self.tickers)
+        return result
+
+    def iter_snapshots(self, dates: Iterable, market: Optional[str] = None) -> Iterator[Tuple[pd.Timestamp, Dict[str, Any]]]:
+        """Yield (date, snapshot) for each date, advancing the estimator in a single forward pass."""
+        for date in sorted(pd.DatetimeIndex(dates)):
+            yield date, self.snapshot(date, market=market)
+
+    def _row(self, date) -> int:
+        """Position of the last row on or before ``date``."""
+        row = self.dates.searchsorted(pd.Timestamp(date), side='right') - 1
+        if row < 0:
+            raise KeyError(f"{date} is before the first date of the returns panel ({self.dates[0]})")
+        return int(row)
+
+    def _covariance_matrix(self, row: int) -> np.ndarray:
+        state = self._state_at(row)
+        if self.method == 'rolling':
+            n = state["n"]
+            if n < 2:
+                cov = np.full((len(self.tickers), len(self.tickers)), np.nan)
+            else:
+                cov = (state["sum_outer"] - np.outer(state["sum"], state["sum"]) / n) / (n - 1)
+        else:
+            cov = state["cov"].copy()
+
+        if self.shrinkage > 0:
+            cov = (1 - self.shrinkage) * cov + self.shrinkage * np.diag(np.diag(cov))
+        insufficient = state["counts"] < self.min_periods
+        cov[insufficient, :] = np.nan
+        cov[:, insufficient] = np.nan
+        return cov
+
+    def _initial_state(self) -> Dict[str, Any]:
+        num_tickers = len(self.tickers)
+        state = {"row": -1, "counts": np.zeros(num_tickers, dtype=np.int64)}
+        if self.method == 'rolling':
+            state.update(n=0, sum=np.zeros(num_tickers), sum_outer=np.zeros((num_tickers, num_tickers)))
+        else:
+            state.update(mean=None, cov=np.zeros((num_tickers, num_tickers)))
+        return state
+
+    def _state_at(self, row: int) -> Dict[str, Any]:
+        if row in self._snapshots:
+            self._snapshots.move_to_end(row)
+            return self._snapshots[row]
+
+        # Resume from the closest state at or before row: the live state or a cached snapshot
+        start = self._state if self._state["row"] <= row else None
+        for cached_row, cached_state in self._snapshots.items():
+            if cached_row <= row and (start is None or cached_row > start["row"]):
+                start = cached_state
+        if start is None:
+            start = self._initial_state()
+
+        state = self._copy_state(start) if start is not self._state else start
+        for next_row in range(state["row"] + 1, row + 1):
+            self._update(state, next_row)
+        self._state = state
+
+        self._snapshots[row] = self._copy_state(state)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return self._snapshots[row]
+
+    def _update(self, state: Dict[str, Any], row: int) -> None:
+        x = self.values[row]
+        state["counts"] += self.observed[row]
+        if self.method == 'rolling':
+            state["n"] += 1
+            state["sum"] += x
+            state["sum_outer"] += np.outer(x, x)
+            if state["n"] > self.window:
+                old_row = row - self.window
+                old = self.values[old_row]
+                state["n"] -= 1
+                state["sum"] -= old
+                state["sum_outer"] -= np.outer(old, old)
+                state["counts"] -= self.observed[old_row]
+        elif state["mean"] is None:
+            state["mean"] = x.copy()
+        else:
+            alpha = self.alpha
+            old_mean = state["mean"]
+            mean = (1 - alpha) * old_mean + alpha * x
+            shift = old_mean - mean
+            deviation = x - mean
+            state["cov"] = (1 - alpha) * (state["cov"] + np.outer(shift, shift)) + alpha * np.outer(deviation, deviation)
+            state["mean"] = mean
+        state["row"] = row
+
+    @staticmethod
+    def _copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in state.items()}
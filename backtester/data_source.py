@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
 import pandas as pd
-import yfinance as yf
 from typing import List, Optional, Dict, Any
 import numpy as np
 import pickle
 import os
 
+from backtester.index_membership import IndexMembership
+from backtester.compact_panel import TickerCodes, compact_cache, compact_prices
+
 class DataSource(ABC):
     """Interface for fetching historical market data."""
     
@@ -14,16 +16,45 @@ class DataSource(ABC):
         """Fetch historical data for given tickers and date range."""
         pass
 
+    def get_point_in_time_data(self, membership: IndexMembership, start_date: str, end_date: str, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Fetch data only for tickers that were index members at some point in the date range
+        (optionally restricted to ``tickers``), with prices on dates outside membership set to NaN.
+        """
+        candidates = membership.tickers_between(start_date, end_date)
+        if tickers is not None:
+            requested = set(tickers)
+            candidates = [ticker for ticker in candidates if ticker in requested]
+        data = self.get_historical_data(candidates, start_date, end_date)
+        ticker_codes = getattr(self, 'ticker_codes', None)
+        if ticker_codes is not None:
+            # Compact panels are keyed by ticker codes, membership by ticker
+            return data.where(membership.mask(data.index, ticker_codes.decode(data.columns)))
+        return membership.apply(data)
+
 class PickleDataSource(DataSource):
-    """Implementation of DataSource that reads from a local pickle file."""
+    """
+    Implementation of DataSource that reads from a local pickle file.
+
+    With ``compact=True`` the cache is held as float32 prices and integer volumes, and
+    get_historical_data returns float32 panels whose columns are integer ticker codes;
+    ``ticker_codes`` maps them back to tickers (see backtester/compact_panel.py).
+    """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, compact: bool = False):
         self.file_path = file_path
+        self.compact = compact
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Cache file not found at {file_path}. Please run cache_sp500_data.py first.")
         
         with open(file_path, 'rb') as f:
             self.data = pickle.load(f)
+
+        # Codes are assigned over the whole cache so they are stable across calls
+        self.ticker_codes = None
+        if compact:
+            self.data = compact_cache(self.data)
+            self.ticker_codes = TickerCodes(sorted(self.data))
             
     def get_historical_data(self, tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
         result = pd.DataFrame()
@@ -42,6 +73,8 @@ class PickleDataSource(DataSource):
             else:
                 print(f"Warning: Ticker {ticker} not found in cache.")
         
+        if self.compact:
+            result, _ = compact_prices(result, self.ticker_codes)
         return result
 
 # TODO: refactor implementations into sep. files, e.g. yahoo_finance_data_source.py
@@ -49,11 +82,13 @@ class YahooFinanceDataSource(DataSource):
     """Implementation of DataSource using Yahoo Finance. Queries historical price data, as well as compares weighted portfolios to SPY ETF."""
     
     def get_historical_data(self, tickers: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+        import yfinance as yf # imported on use so offline runs don't pay for it
         data = yf.download(tickers, start=start_date, end=end_date, auto_adjust=False, threads=True) # newest update replaces "Close" with "Adj Close" if set auto_adjust = True
         return data['Adj Close']
     
     def get_historical_data_with_volume(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
         """Fetch historical price and volume data for given tickers and date range, organized by ticker. Function is DEPRECATED (remove)"""
+        import yfinance as yf
         data = yf.download(tickers, start=start_date, end=end_date)
         result = {}
         for ticker in tickers:
@@ -0,0 +1,104 @@
+import pandas as pd
+import numpy as np
+from typing import List, Optional, Union, Iterable
+
+DateLike = Union[str, pd.Timestamp]
+
+def normalize_ticker(ticker: str) -> str:
+    """Yahoo Finance symbol for a ticker, e.g. 'BRK.B' -> 'BRK-B', as used by cache_sp500_data.py."""
+    return str(ticker).strip().replace('.', '-')
+
+class IndexMembership:
+    """
+    Point-in-time index membership stored as a date x ticker boolean bitmap.
+
+    Built from historical ADD/REMOVE events so a backtest only sees the constituents an index
+    actually had on each date, instead of today's list (survivorship bias). Each event takes effect
+    from its date onwards. Dates between calendar rows map to the most recent row, dates after the
+    calendar keep the last known membership and dates before it have no members.
+    """
+
+    def __init__(self, bitmap: np.ndarray, dates: pd.DatetimeIndex, tickers: pd.Index):
+        if bitmap.shape != (len(dates), len(tickers)):
+            raise ValueError(f"Bitmap shape {bitmap.shape} does not match {len(dates)} dates x {len(tickers)} tickers")
+        self.bitmap = bitmap.astype(bool, copy=False)
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = pd.Index(tickers)
+        self._ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, calendar: Optional[pd.DatetimeIndex] = None) -> 'IndexMembership':
+        """
+        Args:
+            events: DataFrame with 'date', 'ticker' and 'action' ('ADD' or 'REMOVE') columns.
+                    The constituents at the start of the history are listed as ADD events on the first date.
+                    Tickers are normalized to Yahoo symbols ('BRK.B' -> 'BRK-B') to match cached columns.
+            calendar: Dates to materialize rows for (default: business days spanning the events)
+
+        Returns:
+            IndexMembership with one bitmap row per calendar date
+        """
+        events = events.copy()
+        events['date'] = pd.to_datetime(events['date'])
+        events['ticker'] = events['ticker'].map(normalize_ticker)
+        events['action'] = events['action'].str.upper()
+        unknown = set(events['action']) - {'ADD', 'REMOVE'}
+        if unknown:
+            raise ValueError(f"Unknown membership actions: {sorted(unknown)}")
+        events = events.sort_values('date', kind='stable')
+
+        if calendar is None:
+            calendar = pd.bdate_range(events['date'].min(), events['date'].max())
+        calendar = pd.DatetimeIndex(calendar).sort_values()
+        tickers = pd.Index(sorted(events['ticker'].unique()))
+
+        # An event applies from the first calendar date on or after it; the last event per cell wins
+        events['row'] = calendar.searchsorted(events['date'].values, side='left')
+        events['col'] = tickers.get_indexer(events['ticker'])
+        events = events[events['row'] < len(calendar)].drop_duplicates(subset=['row', 'col'], keep='last')
+
+        changes = np.full((len(calendar), len(tickers)), -1, dtype=np.int8)
+        changes[events['row'].values, events['col'].values] = (events['action'] == 'ADD').values.astype(np.int8)
+
+        # Forward fill each column from its most recent event row
+        rows = np.arange(len(calendar))[:, None]
+        last_event_row = np.maximum.accumulate(np.where(changes >= 0, rows, 0), axis=0)
+        state = np.take_along_axis(changes, last_event_row, axis=0)
+        return cls(state == 1, calendar, tickers)
+
+    @classmethod
+    def from_csv(cls, file_path: str, calendar: Optional[pd.DatetimeIndex] = None) -> 'IndexMembership':
+        """Load events from a CSV file with date,ticker,action columns."""
+        return cls.from_events(pd.read_csv(file_path), calendar=calendar)
+
+    def rows_for(self, dates: Iterable[DateLike]) -> np.ndarray:
+        """Bitmap row of the most recent calendar date on or before each date (-1 if before the calendar)."""
+        return self.dates.searchsorted(pd.DatetimeIndex(dates), side='right') - 1
+
+    def mask(self, dates: Iterable[DateLike], tickers: Iterable[str]) -> np.ndarray:
+        """Boolean (len(dates), len(tickers)) array that is True where the ticker was a member on that date."""
+        rows = self.rows_for(dates)
+        cols = self.tickers.get_indexer(pd.Index(tickers))
+        result = self.bitmap[np.maximum(rows, 0)][:, np.maximum(cols, 0)]
+        result &= (rows >= 0)[:, None] & (cols >= 0)[None, :]
+        return result
+
+    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Mask a dates x tickers panel to NaN wherever the ticker was not a member."""
+        return data.where(self.mask(data.index, data.columns))
+
+    def is_member(self, date: DateLike, ticker: str) -> bool:
+        col = self._ticker_index.get(ticker)
+        row = self.rows_for([date])[0]
+        return col is not None and row >= 0 and bool(self.bitmap[row, col])
+
+    def members(self, date: DateLike) -> List[str]:
+        row = self.rows_for([date])[0]
+        return [] if row < 0 else self.tickers[self.bitmap[row]].tolist()
+
+    def tickers_between(self, start_date: DateLike, end_date: DateLike) -> List[str]:
+        """Tickers that were members on at least one date in [start_date, end_date]."""
+        start_row, end_row = self.rows_for([start_date, end_date])
+        if end_row < 0:
+            return []
+        return self.tickers[self.bitmap[max(start_row, 0):end_row + 1].any(axis=0)].tolist()
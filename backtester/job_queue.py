@@ -0,0 +1,320 @@
+"""
+File-backed job queue for distributing backtest sweeps across processes and machines.
+
+Jobs are CLI configs (see backtester/cli.py): a data-store reference such as a PickleDataSource
+path, the OrderGenerator class and params, the engine and the metrics. The queue is a directory,
+typically on a filesystem shared by every host:
+
+    pending/<id>.json   submitted, waiting for a worker
+    claimed/<id>.json   leased by a worker; the file's mtime/ctime is the last heartbeat
+    done/<id>.json      finished, result in results/<id>.pkl
+    failed/<id>.json    gave up after max_attempts, last error in the record
+
+Every transition is a single os.rename, which is atomic on POSIX filesystems, so exactly one worker
+wins each claim. Each claim gets a random ``claim_token``; heartbeat, ack and fail do nothing unless
+the claimed record still carries the caller's token, so a worker whose lease was taken over cannot
+renew, complete or fail the new owner's claim. A claimed job whose heartbeat is older than ``lease_seconds`` (worker killed, host
+lost) is moved back to pending by the next worker that checks, until it has used ``max_attempts``.
+
+Usage:
+    python -m backtester.job_queue submit QUEUE_DIR config.json [config.json ...]
+    python -m backtester.job_queue worker QUEUE_DIR [--max-jobs N] [--idle-timeout SECONDS]
+    python -m backtester.job_queue status QUEUE_DIR
+"""
+import argparse
+import json
+import os
+import pickle
+import socket
+import threading
+import time
+import traceback
+import uuid
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+from backtester.cli import load_config, run_config
+
+STATES = ('pending', 'claimed', 'done', 'failed')
+
+class FileJobQueue:
+    """Directory-based job queue with atomic claim/ack, leases and retries of stale jobs."""
+
+    def __init__(self, root_dir: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.root_dir = root_dir
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for name in STATES + ('results', 'tmp'):
+            os.makedirs(os.path.join(root_dir, name), exist_ok=True)
+
+    def submit(self, job: Dict[str, Any]) -> str:
+        # Zero-padded submit time first so pending jobs are claimed roughly in FIFO order
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:12]}"
+        record = {"id": job_id, "job": job, "attempts": 0, "submitted": time.time(), "worker": None, "claim_token": None, "error": None}
+        self._write_record(self._path('pending', job_id), record)
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the oldest pending job to ``worker_id``, or return None if there is none."""
+        for file_name in sorted(os.listdir(os.path.join(self.root_dir, 'pending'))):
+            if not file_name.endswith('.json'):
+                continue
+            job_id = file_name[:-len('.json')]
+            claimed_path = self._path('claimed', job_id)
+            try:
+                os.rename(self._path('pending', job_id), claimed_path)
+                record = self._read_record(claimed_path)
+            except FileNotFoundError:
+                continue # another worker claimed or moved it first
+            record["worker"] = worker_id
+            record["claim_token"] = uuid.uuid4().hex
+            record["claimed"] = time.time()
+            self._write_record(claimed_path, record)
+            return record
+        return None
+
+    def heartbeat(self, job_id: str, claim_token: str) -> bool:
+        """Renew the lease on a claimed job; False if the lease was lost."""
+        try:
+            with open(self._path('claimed', job_id), 'r') as f:
+                if json.load(f).get("claim_token") != claim_token:
+                    return False
+                # Touch the file whose token was checked; a later claim writes a new file
+                os.utime(f.fileno())
+            return True
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+    def ack(self, job_id: str, claim_token: str, result: Any) -> bool:
+        """Store the result and mark the job done; False (result discarded) if the lease was lost."""
+        # Serialize first so a result that fails to pickle leaves the claim in place
+        tmp_result_path = self._tmp_path(job_id)
+        with open(tmp_result_path, 'wb') as f:
+            pickle.dump(result, f)
+        tmp_path = self._take_claim(job_id, claim_token)
+        if tmp_path is None:
+            os.remove(tmp_result_path)
+            return False
+        os.replace(tmp_result_path, os.path.join(self.root_dir, 'results', f"{job_id}.pkl"))
+        os.rename(tmp_path, self._path('done', job_id))
+        return True
+
+    def fail(self, job_id: str, claim_token: str, error: str) -> Optional[str]:
+        """Record a failed attempt; the job goes back to pending or, after max_attempts, to failed."""
+        return self._release(job_id, error, claim_token)
+
+    def requeue_stale(self) -> List[str]:
+        """Release claimed jobs whose lease has expired; returns their ids."""
+        requeued = []
+        now = time.time()
+        for file_name in os.listdir(os.path.join(self.root_dir, 'claimed')):
+            if not file_name.endswith('.json'):
+                continue
+            job_id = file_name[:-len('.json')]
+            try:
+                # Token and lease times from the same open file, so they describe the same claim
+                with open(self._path('claimed', job_id), 'r') as f:
+                    claim_token = json.load(f).get("claim_token")
+                    stat = os.fstat(f.fileno())
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            # rename() and utime() both update ctime, so a job claimed a moment ago is never stale
+            expired = now - max(stat.st_mtime, stat.st_ctime) > self.lease_seconds
+            # Releasing by token leaves the job alone if another reaper already requeued it and it was claimed again
+            if expired and self._release(job_id, "lease expired", claim_token) is not None:
+                requeued.append(job_id)
+        return requeued
+
+    def status(self, job_id: str) -> Optional[str]:
+        for state in STATES:
+            if os.path.exists(self._path(state, job_id)):
+                return state
+        return None
+
+    def record(self, job_id: str) -> Optional[Dict[str, Any]]:
+        state = self.status(job_id)
+        return self._read_record(self._path(state, job_id)) if state is not None else None
+
+    def result(self, job_id: str) -> Any:
+        with open(os.path.join(self.root_dir, 'results', f"{job_id}.pkl"), 'rb') as f:
+            return pickle.load(f)
+
+    def counts(self) -> Dict[str, int]:
+        return {state: sum(name.endswith('.json') for name in os.listdir(os.path.join(self.root_dir, state))) for state in STATES}
+
+    def _take_claim(self, job_id: str, claim_token: Optional[str]) -> Optional[str]:
+        """
+        Move a claimed job out of claimed/ so no concurrent ack, fail or reaper can also move it.
+        Only a claim holding ``claim_token`` is taken. Returns the temporary path.
+        """
+        claimed_path = self._path('claimed', job_id)
+        if not self._holds_token(claimed_path, claim_token):
+            return None
+        tmp_path = self._tmp_path(job_id)
+        try:
+            os.rename(claimed_path, tmp_path)
+        except FileNotFoundError:
+            return None
+        if not self._holds_token(tmp_path, claim_token):
+            # Re-claimed by another worker between the check and the rename: hand it back
+            os.rename(tmp_path, claimed_path)
+            return None
+        return tmp_path
+
+    def _release(self, job_id: str, error: str, claim_token: Optional[str]) -> Optional[str]:
+        tmp_path = self._take_claim(job_id, claim_token)
+        if tmp_path is None:
+            return None
+        record = self._read_record(tmp_path)
+        record["attempts"] += 1
+        record["error"] = error
+        record["worker"] = None
+        record["claim_token"] = None
+        state = 'failed' if record["attempts"] >= self.max_attempts else 'pending'
+        self._write_record(self._path(state, job_id), record)
+        os.remove(tmp_path)
+        return state
+
+    def _holds_token(self, path: str, claim_token: Optional[str]) -> bool:
+        try:
+            return self._read_record(path).get("claim_token") == claim_token
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+    def _path(self, state: str, job_id: str) -> str:
+        return os.path.join(self.root_dir, state, f"{job_id}.json")
+
+    def _tmp_path(self, job_id: str) -> str:
+        return os.path.join(self.root_dir, 'tmp', f"{job_id}-{uuid.uuid4().hex}")
+
+    def _write_record(self, path: str, record: Dict[str, Any]) -> None:
+        tmp_path = self._tmp_path(record["id"])
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_record(path: str) -> Dict[str, Any]:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one job through the config runner (BacktestEngine + Metrics pipeline)."""
+    return run_config(job)
+
+def run_worker(queue: FileJobQueue, worker_id: Optional[str] = None, max_jobs: Optional[int] = None,
+               poll_interval: float = 1.0, idle_timeout: Optional[float] = None) -> int:
+    """
+    Claim and run jobs until ``max_jobs`` have been processed or the queue has been empty for
+    ``idle_timeout`` seconds (forever if None). Returns the number of jobs processed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    processed = 0
+    idle_since = time.time()
+    while max_jobs is None or processed < max_jobs:
+        queue.requeue_stale()
+        record = queue.claim(worker_id)
+        if record is None:
+            if idle_timeout is not None and time.time() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        job_id = record["id"]
+        claim_token = record["claim_token"]
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat_loop, args=(queue, job_id, claim_token, stop_heartbeat), daemon=True)
+        heartbeat.start()
+        try:
+            result = run_job(record["job"])
+        except Exception:
+            queue.fail(job_id, claim_token, traceback.format_exc())
+        else:
+            queue.ack(job_id, claim_token, result)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        processed += 1
+        idle_since = time.time()
+    return processed
+
+def _heartbeat_loop(queue: FileJobQueue, job_id: str, claim_token: str, stop: threading.Event) -> None:
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.heartbeat(job_id, claim_token):
+            return
+
+class SweepCoordinator:
+    """Submits a sweep of jobs, waits for them and aggregates their metrics."""
+
+    def __init__(self, queue: FileJobQueue):
+        self.queue = queue
+
+    def submit(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        return [self.queue.submit(job) for job in jobs]
+
+    def wait(self, job_ids: List[str], timeout: Optional[float] = None, poll_interval: float = 1.0) -> Dict[str, str]:
+        """Block until every job is done or failed; returns job id -> final state."""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            states = {job_id: self.queue.status(job_id) for job_id in job_ids}
+            if all(state in ('done', 'failed') for state in states.values()):
+                return states
+            if deadline is not None and time.time() >= deadline:
+                unfinished = [job_id for job_id, state in states.items() if state not in ('done', 'failed')]
+                raise TimeoutError(f"{len(unfinished)} of {len(job_ids)} jobs unfinished after {timeout}s")
+            # Workers may all be dead, so the coordinator also reclaims expired leases
+            self.queue.requeue_stale()
+            time.sleep(poll_interval)
+
+    def collect(self, job_ids: List[str]) -> pd.DataFrame:
+        """One row per job: id, state, strategy, params, attempts, error and the job's metrics."""
+        rows = []
+        for job_id in job_ids:
+            record = self.queue.record(job_id)
+            state = self.queue.status(job_id)
+            strategy = record["job"].get("strategy", {})
+            row = {
+                "job_id": job_id,
+                "state": state,
+                "strategy": strategy.get("class"),
+                "params": json.dumps(strategy.get("params", {}), sort_keys=True),
+                "attempts": record["attempts"],
+                "error": record["error"],
+            }
+            if state == 'done':
+                row.update(self.queue.result(job_id)["metrics"])
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="File-backed backtest job queue.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="Submit config files as jobs")
+    submit_parser.add_argument("queue_dir")
+    submit_parser.add_argument("configs", nargs="+")
+
+    worker_parser = subparsers.add_parser("worker", help="Run jobs from the queue")
+    worker_parser.add_argument("queue_dir")
+    worker_parser.add_argument("--max-jobs", type=int, default=None)
+    worker_parser.add_argument("--idle-timeout", type=float, default=None, help="Exit after the queue is empty this long")
+    worker_parser.add_argument("--poll-interval", type=float, default=1.0)
+    worker_parser.add_argument("--lease-seconds", type=float, default=600.0)
+
+    status_parser = subparsers.add_parser("status", help="Show job counts per state")
+    status_parser.add_argument("queue_dir")
+
+    args = parser.parse_args(argv)
+    if args.command == "submit":
+        queue = FileJobQueue(args.queue_dir)
+        for config_path in args.configs:
+            print(queue.submit(load_config(config_path)))
+    elif args.command == "worker":
+        queue = FileJobQueue(args.queue_dir, lease_seconds=args.lease_seconds)
+        processed = run_worker(queue, max_jobs=args.max_jobs, poll_interval=args.poll_interval, idle_timeout=args.idle_timeout)
+        print(f"Processed {processed} jobs")
+    else:
+        print(FileJobQueue(args.queue_dir).counts())
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
 from typing import Dict
-import matplotlib.pyplot as plt
 
 class Metrics(ABC):
     """Interface for calculating portfolio metrics."""
@@ -88,6 +87,7 @@ class ExtendedMetrics(Metrics):
         return metrics
 
     def plot_returns(self, returns: pd.Series, benchmark_returns: pd.Series = None, title: str = "Portfolio Returns", save_path: str = None):
+        import matplotlib.pyplot as plt # imported on use so headless runs don't pay for it
         plt.figure(figsize=(12, 8))
         
         # Calculate Cumulative Returns (Geometric)
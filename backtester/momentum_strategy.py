@@ -7,6 +7,8 @@ class MomentumOrderGenerator(OrderGenerator):
     Momentum strategy implementation that buys when price approaches 52-week high
     and sells when price approaches 52-week low.
     """
+    per_ticker_independent = True
+
     def __init__(self, window_days: int = 125, threshold: float = 0.02):
         """
         Initialize the momentum strategy.
@@ -0,0 +1,113 @@
+"""
+Order netting stage between OrderGenerator.generate_orders and EquityBacktestEngine.run_backtest.
+
+EquityBacktestEngine processes orders in list order and only while their date matches the current
+trading date, so orders must be sorted by date. Its sizing rules are:
+
+    BUY,  0 < float quantity <= 1.0: int(portfolio value at the start of the day * quantity // price) shares
+    BUY,  any other quantity:        that many shares
+          A BUY only fills if cash >= price * shares, so BUYs depend on cash and are never combined.
+    SELL, 0 < float quantity <= 1.0: int(current holding * quantity) shares
+    SELL, any other quantity:        that many shares
+          A SELL is capped at the current holding, so holdings never go below zero.
+
+net_orders() stable-sorts orders by date (keeping the generator's order within a day, which decides
+which BUYs fill when cash is short) and then removes only orders whose effect is known without
+prices or cash:
+
+    - SELLs of a ticker that cannot be held: before its first BUY, or after SELLs that are known to
+      have closed the position (fixed SELLs covering every share that could have been bought, or a
+      SELL of 1.0). Such a SELL trades zero shares.
+    - Fixed orders for zero shares.
+    - Consecutive fixed SELLs of the same ticker on the same date are merged into one SELL of the
+      summed quantity: min(q1, h) + min(q2, h - min(q1, h)) == min(q1 + q2, h).
+
+Portfolio values and holdings are therefore identical to running the sorted orders. The only
+difference is that a removed zero-share trade no longer adds an empty position for the ticker to
+the engine's holdings: the ledger has no all-zero column for it before its first BUY, and days on
+which that ticker has no price do not turn the portfolio value into NaN.
+"""
+import math
+import numbers
+from typing import List, Dict, Any
+
+def _is_fractional(quantity: Any) -> bool:
+    return isinstance(quantity, float) and 0 < quantity <= 1.0
+
+def _is_fixed(quantity: Any) -> bool:
+    return isinstance(quantity, numbers.Real) and not _is_fractional(quantity) and quantity >= 0
+
+def net_orders(orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Args:
+        orders: List of order dicts from OrderGenerator, in any order
+
+    Returns:
+        Dict with 'orders' (date-sorted, netted orders for run_backtest), 'orders_in', 'orders_out',
+        'eliminated', 'flat_sells_dropped', 'zero_quantity_dropped' and 'sells_merged'
+    """
+    sorted_orders = sorted(orders, key=lambda order: order["date"])
+
+    netted = []
+    # Upper bound on shares held per ticker; inf once a BUY is sized by portfolio value
+    max_holding = {}
+    # Whether every fixed quantity for the ticker so far was a whole number of shares
+    whole_shares = {}
+    flat_sells_dropped = zero_quantity_dropped = sells_merged = 0
+
+    for order in sorted_orders:
+        ticker = order["ticker"]
+        raw_quantity = order["quantity"]
+        fractional = _is_fractional(raw_quantity)
+        bound = max_holding.get(ticker, 0)
+
+        if not fractional and not _is_fixed(raw_quantity):
+            # Unusual quantities (negative, non-numeric) pass through and stop tracking the ticker
+            max_holding[ticker] = math.inf
+            whole_shares[ticker] = False
+            netted.append(order)
+            continue
+
+        if not fractional:
+            if raw_quantity == 0 and order["type"] in ("BUY", "SELL"):
+                zero_quantity_dropped += 1
+                continue
+            if not float(raw_quantity).is_integer():
+                whole_shares[ticker] = False
+
+        if order["type"] == "BUY":
+            max_holding[ticker] = math.inf if fractional else bound + raw_quantity
+            netted.append(order)
+
+        elif order["type"] == "SELL":
+            if bound == 0:
+                flat_sells_dropped += 1
+                continue
+
+            if fractional:
+                # int(h * 1.0) == h only when h is a whole number of shares
+                closes_position = raw_quantity == 1.0 and whole_shares.get(ticker, True)
+                max_holding[ticker] = 0 if closes_position else bound
+            else:
+                max_holding[ticker] = max(bound - raw_quantity, 0)
+
+            previous = netted[-1] if netted else None
+            if (not fractional and previous is not None and previous["type"] == "SELL" and previous["ticker"] == ticker
+                    and previous["date"] == order["date"] and _is_fixed(previous["quantity"])):
+                netted[-1] = {**previous, "quantity": previous["quantity"] + raw_quantity}
+                sells_merged += 1
+            else:
+                netted.append(order)
+
+        else:
+            netted.append(order)
+
+    return {
+        "orders": netted,
+        "orders_in": len(orders),
+        "orders_out": len(netted),
+        "eliminated": len(orders) - len(netted),
+        "flat_sells_dropped": flat_sells_dropped,
+        "zero_quantity_dropped": zero_quantity_dropped,
+        "sells_merged": sells_merged,
+    }
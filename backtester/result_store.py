@@ -0,0 +1,235 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+from backtester.backtesters.backtest_engine import BacktestEngine
+from backtester.metrics import Metrics
+from strategies.order_generator import OrderGenerator
+
+MANIFEST_FILE = 'manifest.json'
+
+class BacktestResultStore:
+    """
+    Content-addressed on-disk store of backtest results.
+
+    Each run is keyed by a fingerprint of the data (or an explicit data version), the OrderGenerator
+    class and parameters, the engine class and parameters (initial_cash, ...), the metrics calculator
+    and benchmark, and the source code of those classes. Result DataFrames are stored as parquet files
+    and metrics in a JSON manifest under ``root_dir/<key>/``, so an identical run is read back instead
+    of recomputed. Entries are evicted least-recently-used first once the store exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: Optional[int] = None):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        os.makedirs(root_dir, exist_ok=True)
+
+    def fingerprint(self, data: Any, order_generator: OrderGenerator, engine: BacktestEngine, metrics_calculator: Optional[Metrics] = None,
+                    benchmark_returns: Optional[pd.Series] = None, data_version: Optional[str] = None, code_version: Optional[str] = None) -> str:
+        """Return the store key for a run; pass data_version to skip hashing the data itself."""
+        components = {
+            "data": data_version if data_version is not None else _hash_value(data),
+            "order_generator": _describe(order_generator),
+            "engine": _describe(engine),
+            "metrics": _describe(metrics_calculator) if metrics_calculator is not None else None,
+            "benchmark": _hash_value(benchmark_returns) if benchmark_returns is not None else None,
+            "code": code_version if code_version is not None else _code_version(order_generator, engine, metrics_calculator),
+        }
+        return hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()
+
+    def run(self, order_generator: OrderGenerator, engine: BacktestEngine, data: pd.DataFrame, metrics_calculator: Optional[Metrics] = None,
+            benchmark_returns: Optional[pd.Series] = None, data_version: Optional[str] = None, code_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return stored results for this run, computing and storing them on a miss.
+
+        Returns:
+            Engine results dict plus 'metrics' (empty if no metrics_calculator), 'key' and 'cached'
+        """
+        key = self.fingerprint(data, order_generator, engine, metrics_calculator, benchmark_returns, data_version, code_version)
+        stored = self.get(key)
+        if stored is not None:
+            return stored
+
+        # Engines consume orders in date order; strategies emit them ticker by ticker
+        orders = sorted(order_generator.generate_orders(data), key=lambda order: order["date"])
+        results = engine.run_backtest(orders, data)
+
+        metrics = {}
+        if metrics_calculator is not None:
+            portfolio_values = results["portfolio_values"]["Portfolio Value"]
+            returns = portfolio_values.pct_change().dropna()
+            metrics = metrics_calculator.calculate(portfolio_values, returns, benchmark_returns, data, results.get("daily_holdings_and_cash"))
+
+        info = {
+            "order_generator": type(order_generator).__name__,
+            "order_generator_params": _describe(order_generator)["params"],
+            "engine": type(engine).__name__,
+            "initial_cash": engine.initial_cash,
+            "data_version": data_version,
+        }
+        self.put(key, results, metrics, info)
+        return {**results, "metrics": metrics, "key": key, "cached": False}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a stored run, or None if the key is not in the store."""
+        entry_dir = os.path.join(self.root_dir, key)
+        manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        results = {name: pd.read_parquet(os.path.join(entry_dir, f"{name}.parquet")) for name in manifest["frames"]}
+        # The manifest's mtime records the last access for garbage collection
+        os.utime(manifest_path)
+        return {**results, "metrics": manifest["metrics"], "key": key, "cached": True}
+
+    def put(self, key: str, results: Dict[str, Any], metrics: Dict[str, float], info: Optional[Dict[str, Any]] = None) -> None:
+        """Store the DataFrame/Series values of ``results`` and ``metrics`` under ``key``."""
+        entry_dir = os.path.join(self.root_dir, key)
+        if os.path.exists(entry_dir):
+            return
+        tmp_dir = os.path.join(self.root_dir, f".tmp-{key}-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            frames = []
+            for name, value in results.items():
+                if isinstance(value, pd.Series):
+                    value = value.to_frame()
+                if isinstance(value, pd.DataFrame):
+                    frame = value.copy()
+                    frame.columns = [str(column) for column in frame.columns]
+                    frame.to_parquet(os.path.join(tmp_dir, f"{name}.parquet"))
+                    frames.append(name)
+            size_bytes = sum(os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir))
+            manifest = {
+                "key": key,
+                "created": time.time(),
+                "frames": frames,
+                "metrics": {name: float(value) for name, value in metrics.items()},
+                "size_bytes": size_bytes,
+                **(info or {}),
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, default=str)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same key first; its entry is identical
+            if not os.path.exists(os.path.join(entry_dir, MANIFEST_FILE)):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if self.max_bytes is not None:
+            self.gc(self.max_bytes)
+
+    def list_runs(self) -> pd.DataFrame:
+        """One row per stored run with its description, metrics, size and last access time."""
+        rows = []
+        for key in os.listdir(self.root_dir):
+            manifest_path = os.path.join(self.root_dir, key, MANIFEST_FILE)
+            if key.startswith('.') or not os.path.exists(manifest_path):
+                continue
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            metrics = manifest.pop("metrics")
+            manifest.pop("frames")
+            manifest["last_access"] = os.path.getmtime(manifest_path)
+            rows.append({**manifest, **metrics})
+        if not rows:
+            return pd.DataFrame(columns=["key", "created", "last_access", "size_bytes"])
+        return pd.DataFrame(rows).sort_values("created").reset_index(drop=True)
+
+    def query(self, **filters: Any) -> pd.DataFrame:
+        """List stored runs whose columns equal the given values, e.g. query(order_generator="MeanReversionOrderGenerator")."""
+        runs = self.list_runs()
+        for column, value in filters.items():
+            if column not in runs.columns:
+                return runs.iloc[0:0]
+            runs = runs[runs[column] == value]
+        return runs
+
+    def total_bytes(self) -> int:
+        runs = self.list_runs()
+        return int(runs["size_bytes"].sum()) if not runs.empty else 0
+
+    def gc(self, max_bytes: int) -> List[str]:
+        """Evict least recently accessed runs until the store is at most ``max_bytes``; returns evicted keys."""
+        runs = self.list_runs().sort_values("last_access")
+        total = int(runs["size_bytes"].sum()) if not runs.empty else 0
+        evicted = []
+        for key, size_bytes in zip(runs["key"], runs["size_bytes"]):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.root_dir, key), ignore_errors=True)
+            total -= size_bytes
+            evicted.append(key)
+        return evicted
+
+def _describe(obj: Any) -> Dict[str, Any]:
+    """Class name plus canonical public attributes of a strategy/engine/metrics object."""
+    params = {name: _canonical(value) for name, value in vars(obj).items() if not name.startswith('_')}
+    return {"class": f"{type(obj).__module__}.{type(obj).__qualname__}", "params": params}
+
+def _canonical(value: Any) -> Any:
+    """JSON-serializable, deterministic representation of a parameter value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.generic,)):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
+        return _hash_value(value)
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, '__dict__'):
+        return _describe(value)
+    return repr(value)
+
+def _hash_value(value: Any) -> str:
+    """Content hash of a DataFrame/Series/array, or a dict of them (e.g. BAB's per-ticker data)."""
+    digest = hashlib.sha256()
+    if isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(str(key).encode())
+            digest.update(_hash_value(value[key]).encode())
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(repr(list(value.dtypes) if isinstance(value, pd.DataFrame) else value.dtype).encode())
+    elif isinstance(value, pd.Index):
+        digest.update(pd.util.hash_pandas_object(value).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, value.dtype.str)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+def _code_version(*objects: Any) -> str:
+    """Hash of the source of every module defining the classes (and base classes) of ``objects``."""
+    modules = set()
+    for obj in objects:
+        if obj is None:
+            continue
+        for cls in type(obj).__mro__:
+            if cls.__module__ not in ('builtins', 'abc'):
+                modules.add(cls.__module__)
+    digest = hashlib.sha256()
+    for module_name in sorted(modules):
+        digest.update(module_name.encode())
+        try:
+            digest.update(inspect.getsource(sys.modules[module_name]).encode())
+        except (OSError, TypeError, KeyError):
+            pass
+    return digest.hexdigest()
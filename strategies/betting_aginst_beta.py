@@ -1,16 +1,34 @@
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-from .order_generator import OrderGenerator
+from backtester.index_membership import IndexMembership
+from .order_generator import OrderGenerator, TargetWeightGenerator
 
-class BettingAgainstBetaOrderGenerator(OrderGenerator):
-    """Betting Against Beta (BAB) strategy implementation."""
+class BettingAgainstBetaOrderGenerator(OrderGenerator, TargetWeightGenerator):
+    """
+    Betting Against Beta (BAB) strategy implementation.
+
+    generate_orders() emits fixed-size BUY/SELL orders; generate_target_weights() expresses the same
+    long low-beta / short high-beta book as weights for TargetWeightBacktestEngine, which sizes
+    positions off the live portfolio value. Both accept either a dates x tickers price panel (as
+    returned by DataSource.get_historical_data) or a {ticker: DataFrame with 'Adj Close'} dict, and
+    need SPY among the tickers.
+    """
     
-    def __init__(self, lookback_period: int = 60, rebalance_frequency: str = 'ME', starting_portfolio_value: float = 100000):
+    def __init__(self, lookback_period: int = 60, rebalance_frequency: str = 'ME', starting_portfolio_value: float = 100000, membership: Optional[IndexMembership] = None):
         self.lookback_period = lookback_period
         self.rebalance_frequency = rebalance_frequency
         self.starting_portfolio_value = starting_portfolio_value
+        # Optional point-in-time index membership; when set, only tickers in the index on a rebalance date are ranked
+        self.membership = membership
     
+    @staticmethod
+    def ticker_frames(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        """{ticker: DataFrame with an 'Adj Close' column}, from a price panel or such a dict."""
+        if isinstance(data, pd.DataFrame):
+            return {ticker: data[ticker].to_frame(name='Adj Close') for ticker in data.columns}
+        return data
+
     def calculate_beta(self, stock_returns: pd.Series, market_returns: pd.Series) -> float:
         """
         Calculate beta of a stock relative to the market.
@@ -22,9 +40,13 @@ class BettingAgainstBetaOrderGenerator(OrderGenerator):
 
     def calculate_betas(self, data, spy_returns, date):
         beta_values = {}
-        for ticker, df in data.items():
-            if ticker == 'SPY':
-                continue
+        tickers = [ticker for ticker in data.keys() if ticker != 'SPY']
+        if self.membership is not None:
+            active = self.membership.mask([date], tickers)[0]
+            tickers = [ticker for ticker, is_active in zip(tickers, active) if is_active]
+
+        for ticker in tickers:
+            df = data[ticker]
             stock_returns = df['Adj Close'].pct_change(fill_method=None).dropna()
 
             combined_returns = pd.concat([stock_returns, spy_returns], axis=1, join='inner').loc[:date]
@@ -40,7 +62,14 @@ class BettingAgainstBetaOrderGenerator(OrderGenerator):
 
         return beta_values
 
-    def generate_orders_for_date(self, beta_values, date):
+    def beta_neutral_deciles(self, beta_values) -> Tuple[List[str], List[str], float, float]:
+        """
+        Split tickers into the bottom and top beta deciles.
+
+        Returns:
+            (low_beta_tickers, high_beta_tickers, low_beta_weight, high_beta_weight), where the weights are
+            the beta-neutral fractions of the book allocated to each leg
+        """
         beta_series = pd.Series(beta_values)
         beta_series = beta_series.dropna()
         sorted_beta = beta_series.sort_values()
@@ -56,6 +85,19 @@ class BettingAgainstBetaOrderGenerator(OrderGenerator):
         # ensure beta neutrality with equal weights
         low_beta_weight = avg_high_beta / (avg_low_beta + avg_high_beta)
         high_beta_weight = avg_low_beta / (avg_low_beta + avg_high_beta)
+        return low_beta_tickers, high_beta_tickers, low_beta_weight, high_beta_weight
+
+    def target_weights_for_date(self, beta_values) -> pd.Series:
+        """Equal-weighted long bottom decile and short top decile, as signed fractions of portfolio value."""
+        low_beta_tickers, high_beta_tickers, low_beta_weight, high_beta_weight = self.beta_neutral_deciles(beta_values)
+        weights = pd.Series(0.0, index=low_beta_tickers + high_beta_tickers)
+        weights[low_beta_tickers] = low_beta_weight / len(low_beta_tickers)
+        weights[high_beta_tickers] = -high_beta_weight / len(high_beta_tickers)
+        return weights
+
+    def generate_orders_for_date(self, beta_values, date):
+        low_beta_tickers, high_beta_tickers, low_beta_weight, high_beta_weight = self.beta_neutral_deciles(beta_values)
+        decile_size = len(low_beta_tickers)
 
         orders = []
 
@@ -83,7 +125,8 @@ class BettingAgainstBetaOrderGenerator(OrderGenerator):
 
         return orders
 
-    def generate_orders(self, data: Dict[str, pd.DataFrame]) -> List[Dict[str, Any]]:
+    def rebalance_schedule(self, data: Dict[str, pd.DataFrame]) -> Tuple[pd.Series, pd.DatetimeIndex]:
+        """Return SPY returns and the rebalance dates after the first full lookback window."""
         spy_data = data.get('SPY')
         if spy_data is None:
             raise ValueError("SPY data is required for beta calculation.")
@@ -94,6 +137,24 @@ class BettingAgainstBetaOrderGenerator(OrderGenerator):
         start_date = spy_returns.index[self.lookback_period]
         end_date = spy_returns.index[-1]
         rebalance_dates = pd.date_range(start=start_date, end=end_date, freq=self.rebalance_frequency)
+        return spy_returns, rebalance_dates
+
+    def generate_target_weights(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> pd.DataFrame:
+        data = self.ticker_frames(data)
+        spy_returns, rebalance_dates = self.rebalance_schedule(data)
+
+        target_weights = {}
+        for date in rebalance_dates:
+            beta_values = self.calculate_betas(data, spy_returns, date)
+            if len(beta_values) < 20:
+                continue
+            target_weights[date] = self.target_weights_for_date(beta_values)
+
+        return pd.DataFrame.from_dict(target_weights, orient='index')
+
+    def generate_orders(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> List[Dict[str, Any]]:
+        data = self.ticker_frames(data)
+        spy_returns, rebalance_dates = self.rebalance_schedule(data)
 
         all_orders = []
 
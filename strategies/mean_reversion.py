@@ -5,6 +5,8 @@ from .order_generator import OrderGenerator
 
 class MeanReversionOrderGenerator(OrderGenerator):
     """Mean reversion strategy implementation with 100-day rolling window."""
+    per_ticker_independent = True
+
     def generate_orders(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
         orders = []
         tickers = data.columns
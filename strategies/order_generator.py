@@ -4,8 +4,25 @@ from typing import List, Dict, Any
 
 class OrderGenerator(ABC):
     """Interface for generating trade orders based on a strategy."""
+
+    # True if each ticker's orders depend only on that ticker's own column, so the
+    # columns can be split across processes (see strategies/parallel_order_generator.py)
+    per_ticker_independent = False
     
     @abstractmethod
     def generate_orders(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
         """Generate orders given historical price data."""
         pass
+
+
+class TargetWeightGenerator(ABC):
+    """Interface for strategies that express intent as target portfolio weights instead of orders."""
+
+    @abstractmethod
+    def generate_target_weights(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Given a dates x tickers price panel (as from DataSource.get_historical_data), return a
+        rebalance-date x ticker DataFrame of target weights as fractions of portfolio value (negative
+        for shorts). Only rebalance dates need rows; a missing or NaN weight in a row means flat.
+        """
+        pass
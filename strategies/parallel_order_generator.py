@@ -0,0 +1,88 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional
+
+from .order_generator import OrderGenerator
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: the creating process owns cleanup, workers must not unlink on exit
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def _date_sorted(orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(orders, key=lambda order: order["date"])
+
+def _generate_chunk(order_generator: OrderGenerator, shm_name: str, shape: tuple, dtype: str,
+                    index: pd.Index, columns: pd.Index, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Worker: run the wrapped generator on columns [start, stop) of the shared price panel."""
+    shm = _attach(shm_name)
+    try:
+        panel = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, order='F')
+        # Column slices of a Fortran-ordered array are contiguous views, no copy is made
+        chunk = pd.DataFrame(panel[:, start:stop], index=index, columns=columns[start:stop], copy=False)
+        orders = _date_sorted(order_generator.generate_orders(chunk))
+        del chunk, panel
+        return orders
+    finally:
+        shm.close()
+
+class ParallelOrderGenerator(OrderGenerator):
+    """
+    Runs a per-ticker OrderGenerator over column chunks of the price panel in a process pool.
+
+    The panel is copied once into shared memory and each worker reads its columns from there
+    without copying. Chunk results are merged into one stream sorted by date; within a date, orders
+    keep the wrapped generator's ticker order, so the result equals its serial output stably sorted
+    by date. Generators that do not set ``per_ticker_independent`` (e.g. cross-sectional strategies
+    like BAB) run serially, or raise ValueError if ``strict`` is set.
+    """
+    per_ticker_independent = True
+
+    def __init__(self, order_generator: OrderGenerator, max_workers: Optional[int] = None, num_chunks: Optional[int] = None, strict: bool = False):
+        self.order_generator = order_generator
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.num_chunks = num_chunks or self.max_workers
+        self.strict = strict
+
+    def generate_orders(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        if not getattr(self.order_generator, 'per_ticker_independent', False):
+            message = f"{type(self.order_generator).__name__} is not per-ticker independent"
+            if self.strict:
+                raise ValueError(f"{message}, it cannot be split across processes")
+            print(f"Warning: {message}, generating orders serially.")
+            return _date_sorted(self.order_generator.generate_orders(data))
+
+        num_chunks = min(self.num_chunks, len(data.columns))
+        if num_chunks <= 1:
+            return _date_sorted(self.order_generator.generate_orders(data))
+
+        values = np.asfortranarray(data.to_numpy())
+        if not np.issubdtype(values.dtype, np.number):
+            raise ValueError(f"Price panel must be numeric to share between processes, got {values.dtype}")
+
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, order='F')
+            shared[...] = values
+            del shared
+
+            boundaries = np.linspace(0, len(data.columns), num_chunks + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, num_chunks)) as pool:
+                futures = [
+                    pool.submit(_generate_chunk, self.order_generator, shm.name, values.shape, values.dtype.str,
+                                data.index, data.columns, start, stop)
+                    for start, stop in zip(boundaries[:-1], boundaries[1:])
+                ]
+                chunk_orders = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        # heapq.merge is stable across chunks, so ties on a date keep column order
+        return list(heapq.merge(*chunk_orders, key=lambda order: order["date"]))
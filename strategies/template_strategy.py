@@ -6,6 +6,9 @@ from strategies.order_generator import OrderGenerator
 
 class TemplateStrategy(OrderGenerator):
     """Your strategy description here."""
+
+    # Set to True if each ticker's orders only use that ticker's column (enables ParallelOrderGenerator)
+    per_ticker_independent = False
     
     def __init__(self, window=20):
         self.window = window
@@ -0,0 +1,105 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import asyncio
+import threading
+import time
+import pandas as pd
+from backtester.async_data_source import AsyncYahooFinanceDataSource
+
+DATES = pd.date_range(start='2023-01-02', periods=5, freq='B')
+
+def make_prices(tickers):
+    return pd.DataFrame({ticker: [float(i) for i in range(len(DATES))] for ticker in tickers}, index=DATES)
+
+class TestAsyncYahooFinanceDataSource(unittest.TestCase):
+
+    def test_batches_fetched_concurrently_within_limit(self):
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        async def fetch(tickers, start_date, end_date):
+            state["calls"] += 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.05)
+            state["active"] -= 1
+            return make_prices(tickers)
+
+        tickers = [f"T{i}" for i in range(10)]
+        with AsyncYahooFinanceDataSource(fetch=fetch, batch_size=2, max_concurrency=3) as data_source:
+            data = data_source.get_historical_data(tickers, '2023-01-01', '2023-01-10')
+
+        self.assertEqual(list(data.columns), tickers)
+        self.assertEqual(state["calls"], 5)
+        self.assertEqual(state["peak"], 3)
+
+    def test_failed_and_timed_out_batches_are_retried(self):
+        attempts = {"count": 0}
+
+        async def fetch(tickers, start_date, end_date):
+            attempts["count"] += 1
+            if attempts["count"] == 1:
+                raise ConnectionError("rate limited")
+            if attempts["count"] == 2:
+                await asyncio.sleep(1)
+            return make_prices(tickers)
+
+        with AsyncYahooFinanceDataSource(fetch=fetch, max_retries=2, backoff=0, timeout=0.1) as data_source:
+            data = data_source.get_historical_data(['AAPL'], '2023-01-01', '2023-01-10')
+
+        self.assertEqual(attempts["count"], 3)
+        self.assertEqual(list(data.columns), ['AAPL'])
+
+    def test_retries_exhausted_raises(self):
+        def fetch(tickers, start_date, end_date):
+            raise ConnectionError("down")
+
+        with AsyncYahooFinanceDataSource(fetch=fetch, max_retries=1, backoff=0) as data_source:
+            with self.assertRaises(ConnectionError):
+                data_source.get_historical_data(['AAPL'], '2023-01-01', '2023-01-10')
+
+    def test_timed_out_threads_count_toward_concurrency(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        def fetch(tickers, start_date, end_date):
+            with lock:
+                state["calls"] += 1
+                call = state["calls"]
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                if call <= 2:
+                    time.sleep(0.2) # outlives the timeout, keeps running after the wait is abandoned
+                return make_prices(tickers)
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        with AsyncYahooFinanceDataSource(fetch=fetch, max_concurrency=1, max_retries=2, backoff=0, timeout=0.05) as data_source:
+            data = data_source.get_historical_data(['AAPL'], '2023-01-01', '2023-01-10')
+
+        self.assertEqual(state["calls"], 3)
+        self.assertEqual(state["peak"], 1)
+        self.assertEqual(list(data.columns), ['AAPL'])
+
+    def test_next_window_prefetched_while_current_is_consumed(self):
+        second_window_started = threading.Event()
+
+        def fetch(tickers, start_date, end_date):
+            if start_date == '2023-02-01':
+                second_window_started.set()
+            return make_prices(tickers)
+
+        windows = [('2023-01-01', '2023-01-31'), ('2023-02-01', '2023-02-28')]
+        with AsyncYahooFinanceDataSource(fetch=fetch) as data_source:
+            frames = data_source.iter_windows(['AAPL'], windows)
+            next(frames)
+            # The consumer has not asked for the second window yet
+            self.assertTrue(second_window_started.wait(timeout=5))
+            self.assertEqual(len(list(frames)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+from unittest import mock
+import tempfile
+import pandas as pd
+import numpy as np
+from strategies.mean_reversion import MeanReversionOrderGenerator
+from backtester.backtesters.equity_backtest import EquityBacktestEngine
+from backtester.backtesters.checkpoint import load_checkpoint
+
+class CrashingEngine(EquityBacktestEngine):
+    """Fails on the first order executed on or after ``crash_date``, like a killed kernel."""
+
+    def __init__(self, *args, crash_date=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.crash_date = crash_date
+
+    def _execute_order(self, order, price, cash, holdings, current_portfolio_value):
+        if self.crash_date is not None and order["date"] >= self.crash_date:
+            raise MemoryError("simulated crash")
+        return super()._execute_order(order, price, cash, holdings, current_portfolio_value)
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp_dir.name, 'run.ckpt')
+        num_days = 300
+        dates = pd.date_range(start='2023-01-02', periods=num_days, freq='B')
+        np.random.seed(6)
+        self.data = pd.DataFrame({
+            'AAPL': 100 + np.cumsum(np.random.normal(0, 1, size=num_days)),
+            'MSFT': 100 + np.cumsum(np.random.normal(0, 1, size=num_days)),
+        }, index=dates)
+        self.orders = sorted(MeanReversionOrderGenerator().generate_orders(self.data), key=lambda order: order['date'])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_resumed_run_matches_uninterrupted_run(self):
+        expected = EquityBacktestEngine(initial_cash=50000).run_backtest(self.orders, self.data)
+
+        crashing = CrashingEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path, checkpoint_interval=20, crash_date=self.data.index[250])
+        with self.assertRaises(MemoryError):
+            crashing.run_backtest(self.orders, self.data)
+        self.assertEqual(load_checkpoint(self.checkpoint_path)["next_date_index"], 240)
+
+        resumed = EquityBacktestEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path, checkpoint_interval=20).run_backtest(self.orders, self.data)
+        pd.testing.assert_frame_equal(resumed["portfolio_values"], expected["portfolio_values"])
+        pd.testing.assert_frame_equal(resumed["daily_holdings_and_cash"], expected["daily_holdings_and_cash"])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_checkpoint_from_other_run_rejected(self):
+        crashing = CrashingEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path, checkpoint_interval=20, crash_date=self.data.index[100])
+        with self.assertRaises(MemoryError):
+            crashing.run_backtest(self.orders, self.data)
+
+        engine = EquityBacktestEngine(initial_cash=60000, checkpoint_path=self.checkpoint_path)
+        with self.assertRaises(ValueError):
+            engine.run_backtest(self.orders, self.data)
+        # resume=False ignores and replaces the stale checkpoint
+        results = engine.run_backtest(self.orders, self.data, resume=False)
+        self.assertEqual(results["portfolio_values"].iloc[0]['Portfolio Value'], 60000)
+
+    def test_checkpoint_from_same_shape_panel_with_other_prices_rejected(self):
+        crashing = CrashingEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path, checkpoint_interval=20, crash_date=self.data.index[100])
+        with self.assertRaises(MemoryError):
+            crashing.run_backtest(self.orders, self.data)
+
+        # Same dates, tickers and orders, different prices
+        engine = EquityBacktestEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path)
+        with self.assertRaises(ValueError):
+            engine.run_backtest(self.orders, self.data * 1.5)
+
+    def test_checkpoint_from_orders_with_other_quantities_rejected(self):
+        crashing = CrashingEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path, checkpoint_interval=20, crash_date=self.data.index[100])
+        with self.assertRaises(MemoryError):
+            crashing.run_backtest(self.orders, self.data)
+
+        changed_orders = [dict(order, quantity=0.5) if order["type"] == "BUY" else order for order in self.orders]
+        engine = EquityBacktestEngine(initial_cash=50000, checkpoint_path=self.checkpoint_path)
+        with self.assertRaises(ValueError):
+            engine.run_backtest(changed_orders, self.data)
+
+    def test_no_signature_without_checkpoint_path(self):
+        engine = EquityBacktestEngine(initial_cash=50000)
+        with mock.patch.object(EquityBacktestEngine, '_run_signature', side_effect=AssertionError("signature computed")):
+            results = engine.run_backtest(self.orders, self.data)
+        self.assertEqual(len(results["portfolio_values"]), len(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
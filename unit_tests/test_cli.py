@@ -0,0 +1,105 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import json
+import pickle
+import subprocess
+import tempfile
+import pandas as pd
+import numpy as np
+from backtester.cli import load_config, run_config
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Seconds allowed for importing the runner stack on top of pandas/numpy
+IMPORT_TIME_BUDGET = 0.25
+
+IMPORT_TIME_SCRIPT = """
+import json, sys, time
+import pandas, numpy
+start = time.perf_counter()
+import backtester.cli, backtester.metrics, backtester.data_source, backtester.async_data_source
+import backtester.backtesters.equity_backtest, strategies.mean_reversion
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "heavy": [m for m in ("matplotlib", "yfinance") if m in sys.modules]}))
+"""
+
+def write_cache(path, tickers, num_days=200):
+    dates = pd.date_range(start='2020-01-01', periods=num_days, freq='B')
+    np.random.seed(0)
+    cache = {}
+    for ticker in tickers:
+        prices = 100 + np.cumsum(np.random.normal(0, 1, size=num_days))
+        cache[ticker] = pd.DataFrame({'Adj Close': prices, 'Volume': 1000.0, 'VWAP': prices}, index=dates)
+    with open(path, 'wb') as f:
+        pickle.dump(cache, f)
+
+class TestCli(unittest.TestCase):
+
+    def test_import_time_budget_without_heavy_backends(self):
+        output = subprocess.run([sys.executable, "-c", IMPORT_TIME_SCRIPT], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result["heavy"], [])
+        self.assertLess(result["elapsed"], IMPORT_TIME_BUDGET)
+
+    def test_run_config_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'cache.pkl')
+            write_cache(cache_path, ['AAPL', 'MSFT', 'SPY'])
+            config_path = os.path.join(tmp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump({
+                    "data_source": {"class": "backtester.data_source.PickleDataSource", "params": {"file_path": cache_path}},
+                    "tickers": ["AAPL", "MSFT"],
+                    "start_date": "2020-01-01",
+                    "end_date": "2021-01-01",
+                    "strategy": {"class": "backtester.momentum_strategy.MomentumOrderGenerator", "params": {"window_days": 20}},
+                    "engine": {"class": "backtester.backtesters.equity_backtest.EquityBacktestEngine", "params": {"initial_cash": 50000}},
+                }, f)
+
+            results = run_config(load_config(config_path))
+
+        self.assertEqual(results["portfolio_values"].iloc[0], 50000)
+        self.assertIsNotNone(results["benchmark_returns"])
+        self.assertIn('Sharpe Ratio', results["metrics"])
+
+    def test_run_config_target_weight_engine(self):
+        tickers = [f"T{i}" for i in range(25)]
+        dates = pd.date_range(start='2020-01-01', periods=200, freq='B')
+        np.random.seed(3)
+        market = np.random.normal(0, 0.01, len(dates))
+        cache = {'SPY': pd.DataFrame({'Adj Close': 100 * np.cumprod(1 + market)}, index=dates)}
+        for i, ticker in enumerate(tickers):
+            returns = (0.5 + i * 0.05) * market + np.random.normal(0, 0.005, len(dates))
+            cache[ticker] = pd.DataFrame({'Adj Close': 50 * np.cumprod(1 + returns)}, index=dates)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'cache.pkl')
+            with open(cache_path, 'wb') as f:
+                pickle.dump(cache, f)
+            results = run_config({
+                "data_source": {"class": "backtester.data_source.PickleDataSource", "params": {"file_path": cache_path}},
+                "tickers": tickers + ["SPY"],
+                "start_date": "2020-01-01",
+                "end_date": "2021-01-01",
+                "strategy": {"class": "strategies.betting_aginst_beta.BettingAgainstBetaOrderGenerator", "params": {"lookback_period": 60}},
+                "engine": {"class": "backtester.backtesters.target_weight_backtest.TargetWeightBacktestEngine", "params": {"initial_cash": 100000}},
+            })
+
+        holdings = results["daily_holdings_and_cash"].drop(columns='Cash')
+        self.assertTrue((holdings > 0).any().any())
+        self.assertTrue((holdings < 0).any().any())
+        self.assertIn('Sharpe Ratio', results["metrics"])
+
+    def test_missing_required_key(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({"tickers": ["AAPL"]}, f)
+        try:
+            with self.assertRaises(ValueError):
+                load_config(f.name)
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import pandas as pd
+import numpy as np
+from backtester.covariance import CovarianceService
+from strategies.betting_aginst_beta import BettingAgainstBetaOrderGenerator
+
+class TestCovarianceService(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.bdate_range('2023-01-02', periods=150)
+        np.random.seed(5)
+        market = np.random.normal(0, 0.01, len(dates))
+        self.returns = pd.DataFrame({
+            'SPY': market,
+            'AAPL': 1.3 * market + np.random.normal(0, 0.01, len(dates)),
+            'XOM': 0.6 * market + np.random.normal(0, 0.01, len(dates)),
+        }, index=dates)
+        self.date = dates[120]
+
+    def test_rolling_matches_pandas(self):
+        service = CovarianceService(self.returns, method='rolling', window=60)
+        expected = self.returns.rolling(60).cov().loc[self.date]
+        pd.testing.assert_frame_equal(service.covariance(self.date), expected, check_names=False)
+        self.assertTrue(service.covariance(self.returns.index[30]).isna().all().all())
+
+    def test_ewma_matches_pandas(self):
+        service = CovarianceService(self.returns, method='ewma', alpha=0.05)
+        expected = self.returns.ewm(alpha=0.05, adjust=False).cov(bias=True).loc[self.date]
+        pd.testing.assert_frame_equal(service.covariance(self.date), expected, check_names=False)
+
+    def test_out_of_order_dates_resume_from_snapshots(self):
+        service = CovarianceService(self.returns, method='rolling', window=60, max_snapshots=2)
+        dates = self.returns.index[[140, 70, 100, 149, 80]]
+        for date in dates:
+            expected = self.returns.loc[:date].iloc[-60:].cov()
+            pd.testing.assert_frame_equal(service.covariance(date), expected)
+        self.assertLessEqual(len(service._snapshots), 2)
+
+    def test_derived_statistics_and_shrinkage(self):
+        service = CovarianceService(self.returns, method='rolling', window=60)
+        snapshot = service.snapshot(self.date, market='SPY')
+        window = self.returns.loc[:self.date].iloc[-60:]
+
+        bab = BettingAgainstBetaOrderGenerator()
+        self.assertAlmostEqual(snapshot["betas"]['AAPL'], bab.calculate_beta(window['AAPL'], window['SPY']))
+        pd.testing.assert_series_equal(snapshot["volatilities"], window.std() * np.sqrt(252))
+        pd.testing.assert_frame_equal(snapshot["correlations"], window.corr())
+
+        shrunk = CovarianceService(self.returns, method='rolling', window=60, shrinkage=0.5).covariance(self.date)
+        covariance = snapshot["covariance"]
+        self.assertAlmostEqual(shrunk.at['AAPL', 'AAPL'], covariance.at['AAPL', 'AAPL'])
+        self.assertAlmostEqual(shrunk.at['AAPL', 'SPY'], 0.5 * covariance.at['AAPL', 'SPY'])
+
+    def test_missing_history_reported_as_nan(self):
+        returns = self.returns.copy()
+        returns.iloc[:100, returns.columns.get_loc('XOM')] = np.nan
+        service = CovarianceService(returns, method='rolling', window=60)
+        covariance = service.covariance(self.date)
+        self.assertTrue(covariance['XOM'].isna().all())
+        self.assertFalse(np.isnan(covariance.at['AAPL', 'SPY']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import tempfile
+import pandas as pd
+import numpy as np
+from backtester.index_membership import IndexMembership
+from backtester.data_source import DataSource
+from strategies.betting_aginst_beta import BettingAgainstBetaOrderGenerator
+
+EVENTS = pd.DataFrame({
+    'date': ['2023-01-02', '2023-01-02', '2023-01-02', '2023-02-01', '2023-02-01', '2023-03-01'],
+    'ticker': ['AAPL', 'MSFT', 'XOM', 'NVDA', 'XOM', 'XOM'],
+    'action': ['ADD', 'ADD', 'ADD', 'ADD', 'REMOVE', 'ADD'],
+})
+
+class StaticDataSource(DataSource):
+    def __init__(self, data):
+        self.data = data
+        self.requested = None
+
+    def get_historical_data(self, tickers, start_date, end_date):
+        self.requested = list(tickers)
+        return self.data[tickers]
+
+class TestIndexMembership(unittest.TestCase):
+
+    def setUp(self):
+        self.membership = IndexMembership.from_events(EVENTS, calendar=pd.bdate_range('2023-01-02', '2023-03-31'))
+
+    def test_point_in_time_lookups(self):
+        self.assertEqual(self.membership.members('2023-01-15'), ['AAPL', 'MSFT', 'XOM'])
+        self.assertEqual(self.membership.members('2023-02-15'), ['AAPL', 'MSFT', 'NVDA'])
+        self.assertTrue(self.membership.is_member('2023-03-01', 'XOM'))
+        self.assertFalse(self.membership.is_member('2023-01-31', 'NVDA'))
+        # Weekend maps to the previous business day, dates past the calendar keep the last state
+        self.assertTrue(self.membership.is_member('2023-02-04', 'NVDA'))
+        self.assertTrue(self.membership.is_member('2024-06-01', 'XOM'))
+        self.assertEqual(self.membership.members('2022-12-30'), [])
+        self.assertFalse(self.membership.is_member('2023-02-15', 'TSLA'))
+
+    def test_mask_and_apply_match_lookups(self):
+        dates = pd.bdate_range('2023-01-25', '2023-03-05')
+        panel = pd.DataFrame(1.0, index=dates, columns=['NVDA', 'XOM', 'TSLA'])
+        masked = self.membership.apply(panel)
+        for date in dates:
+            for ticker in panel.columns:
+                self.assertEqual(masked.at[date, ticker] == 1.0, self.membership.is_member(date, ticker))
+
+    def test_tickers_between_and_point_in_time_data(self):
+        self.assertEqual(self.membership.tickers_between('2023-02-06', '2023-02-20'), ['AAPL', 'MSFT', 'NVDA'])
+
+        dates = pd.bdate_range('2023-02-06', '2023-02-20')
+        data_source = StaticDataSource(pd.DataFrame(1.0, index=dates, columns=['AAPL', 'MSFT', 'NVDA', 'XOM']))
+        data = data_source.get_point_in_time_data(self.membership, '2023-02-06', '2023-02-20', tickers=['NVDA', 'XOM'])
+        self.assertEqual(data_source.requested, ['NVDA'])
+        self.assertFalse(data.isna().any().any())
+
+    def test_from_csv(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'membership.csv')
+            EVENTS.to_csv(path, index=False)
+            membership = IndexMembership.from_csv(path)
+        np.testing.assert_array_equal(membership.mask(['2023-02-15'], ['XOM', 'NVDA']), [[False, True]])
+
+    def test_tickers_normalized_to_yahoo_symbols(self):
+        events = pd.DataFrame({'date': ['2023-01-02', '2023-01-02'], 'ticker': ['BRK.B', 'BRK-B'], 'action': ['ADD', 'ADD']})
+        membership = IndexMembership.from_events(events)
+        self.assertEqual(list(membership.tickers), ['BRK-B'])
+        self.assertTrue(membership.is_member('2023-01-02', 'BRK-B'))
+
+    def test_bab_betas_restricted_to_members(self):
+        dates = pd.bdate_range('2023-01-02', '2023-03-31')
+        np.random.seed(0)
+        data = {ticker: pd.DataFrame({'Adj Close': 100 + np.cumsum(np.random.normal(0, 1, len(dates)))}, index=dates)
+                for ticker in ['SPY', 'AAPL', 'MSFT', 'NVDA', 'XOM']}
+        spy_returns = data['SPY']['Adj Close'].pct_change().dropna()
+
+        unrestricted = BettingAgainstBetaOrderGenerator(lookback_period=10).calculate_betas(data, spy_returns, pd.Timestamp('2023-02-15'))
+        restricted = BettingAgainstBetaOrderGenerator(lookback_period=10, membership=self.membership).calculate_betas(data, spy_returns, pd.Timestamp('2023-02-15'))
+
+        self.assertEqual(sorted(unrestricted), ['AAPL', 'MSFT', 'NVDA', 'XOM'])
+        self.assertEqual(sorted(restricted), ['AAPL', 'MSFT', 'NVDA'])
+        self.assertEqual(restricted['NVDA'], unrestricted['NVDA'])
+
+
+if __name__ == '__main__':
+    unittest.main()
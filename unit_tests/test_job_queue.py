@@ -0,0 +1,168 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+from unittest import mock
+import pickle
+import subprocess
+import tempfile
+import time
+import pandas as pd
+import numpy as np
+from backtester.cli import run_config
+from backtester.job_queue import FileJobQueue, SweepCoordinator, run_worker
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def make_job(cache_path, window_days):
+    return {
+        "data_source": {"class": "backtester.data_source.PickleDataSource", "params": {"file_path": cache_path}},
+        "tickers": ["AAPL", "MSFT"],
+        "start_date": "2020-01-01",
+        "end_date": "2021-06-01",
+        "strategy": {"class": "backtester.momentum_strategy.MomentumOrderGenerator", "params": {"window_days": window_days}},
+        "engine": {"class": "backtester.backtesters.equity_backtest.EquityBacktestEngine", "params": {"initial_cash": 100000}},
+    }
+
+class TestFileJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.queue_dir = os.path.join(self.tmp_dir.name, 'queue')
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache.pkl')
+        dates = pd.date_range(start='2020-01-01', periods=300, freq='B')
+        np.random.seed(8)
+        cache = {}
+        for ticker in ['AAPL', 'MSFT', 'SPY']:
+            prices = 100 + np.cumsum(np.random.normal(0, 1, size=len(dates)))
+            cache[ticker] = pd.DataFrame({'Adj Close': prices, 'Volume': 1000.0, 'VWAP': prices}, index=dates)
+        with open(self.cache_path, 'wb') as f:
+            pickle.dump(cache, f)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sweep_across_local_worker_processes(self):
+        queue = FileJobQueue(self.queue_dir)
+        coordinator = SweepCoordinator(queue)
+        jobs = [make_job(self.cache_path, window_days) for window_days in (10, 20, 40, 60, 80)]
+        job_ids = coordinator.submit(jobs)
+
+        workers = [
+            subprocess.Popen([sys.executable, "-m", "backtester.job_queue", "worker", self.queue_dir, "--idle-timeout", "2", "--poll-interval", "0.05"],
+                             cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+            for _ in range(3)
+        ]
+        try:
+            states = coordinator.wait(job_ids, timeout=120, poll_interval=0.1)
+        finally:
+            for worker in workers:
+                worker.wait(timeout=60)
+
+        self.assertEqual(set(states.values()), {'done'})
+        self.assertEqual(queue.counts(), {'pending': 0, 'claimed': 0, 'done': 5, 'failed': 0})
+        summary = coordinator.collect(job_ids)
+        self.assertEqual(list(summary["attempts"]), [0] * 5)
+        expected = run_config(jobs[2])["metrics"]["Sharpe Ratio"]
+        self.assertAlmostEqual(summary.loc[2, "Sharpe Ratio"], expected)
+
+    def test_failing_job_retried_then_failed(self):
+        queue = FileJobQueue(self.queue_dir, max_attempts=2)
+        job = make_job(self.cache_path, 10)
+        job["strategy"]["class"] = "strategies.does_not_exist.Missing"
+        job_id = queue.submit(job)
+
+        self.assertEqual(run_worker(queue, worker_id="w1", max_jobs=2, poll_interval=0.01), 2)
+        record = queue.record(job_id)
+        self.assertEqual(queue.status(job_id), 'failed')
+        self.assertEqual(record["attempts"], 2)
+        self.assertIn("ModuleNotFoundError", record["error"])
+
+    def test_expired_lease_requeued(self):
+        queue = FileJobQueue(self.queue_dir, lease_seconds=0.2)
+        job_id = queue.submit(make_job(self.cache_path, 10))
+        claim = queue.claim("w1")
+        self.assertEqual(claim["id"], job_id)
+        self.assertIsNone(queue.claim("w2"))
+        self.assertEqual(queue.requeue_stale(), [])
+
+        time.sleep(0.3)
+        self.assertEqual(queue.requeue_stale(), [job_id])
+        self.assertEqual(queue.status(job_id), 'pending')
+        self.assertEqual(queue.record(job_id)["attempts"], 1)
+        # The original worker lost its lease
+        self.assertFalse(queue.heartbeat(job_id, claim["claim_token"]))
+        self.assertEqual(queue.claim("w2")["id"], job_id)
+
+    def test_stale_worker_cannot_touch_new_claim(self):
+        queue = FileJobQueue(self.queue_dir, lease_seconds=0.2)
+        job_id = queue.submit(make_job(self.cache_path, 10))
+        stale = queue.claim("w1")
+        time.sleep(0.3)
+        self.assertEqual(queue.requeue_stale(), [job_id])
+        live = queue.claim("w2")
+        self.assertEqual(live["id"], job_id)
+
+        # w1 still thinks it owns the job
+        self.assertFalse(queue.heartbeat(job_id, stale["claim_token"]))
+        self.assertIsNone(queue.fail(job_id, stale["claim_token"], "boom"))
+        self.assertFalse(queue.ack(job_id, stale["claim_token"], {"metrics": {}}))
+        self.assertEqual(queue.status(job_id), 'claimed')
+        self.assertEqual(queue.record(job_id)["attempts"], 1)
+        self.assertEqual(queue.record(job_id)["worker"], "w2")
+        self.assertFalse(os.path.exists(os.path.join(self.queue_dir, 'results', f"{job_id}.pkl")))
+
+        self.assertTrue(queue.heartbeat(job_id, live["claim_token"]))
+        self.assertTrue(queue.ack(job_id, live["claim_token"], {"metrics": {"Sharpe Ratio": 1.0}}))
+        self.assertEqual(queue.status(job_id), 'done')
+        self.assertEqual(queue.result(job_id), {"metrics": {"Sharpe Ratio": 1.0}})
+
+    def test_concurrent_reapers_release_an_expired_lease_once(self):
+        queue = FileJobQueue(self.queue_dir, lease_seconds=0.2, max_attempts=3)
+        job_id = queue.submit(make_job(self.cache_path, 10))
+        queue.claim("w1")
+        time.sleep(0.3)
+
+        real_fstat = os.fstat
+        interleaved = {"live": None}
+
+        def fstat_with_other_reaper(fd):
+            # Reaper A has read the expired claim; reaper B requeues it and w2 claims it before A acts
+            if interleaved["live"] is None:
+                interleaved["live"] = {}
+                self.assertEqual(FileJobQueue(self.queue_dir, lease_seconds=0.2).requeue_stale(), [job_id])
+                interleaved["live"] = queue.claim("w2")
+            return real_fstat(fd)
+
+        with mock.patch('os.fstat', side_effect=fstat_with_other_reaper):
+            self.assertEqual(queue.requeue_stale(), [])
+
+        live = interleaved["live"]
+        self.assertEqual(queue.status(job_id), 'claimed')
+        self.assertEqual(queue.record(job_id)["attempts"], 1)
+        self.assertEqual(queue.record(job_id)["worker"], "w2")
+        self.assertTrue(queue.heartbeat(job_id, live["claim_token"]))
+        self.assertTrue(queue.ack(job_id, live["claim_token"], {"metrics": {}}))
+
+    def test_claim_skips_job_moved_after_rename(self):
+        queue = FileJobQueue(self.queue_dir)
+        first_id = queue.submit(make_job(self.cache_path, 10))
+        second_id = queue.submit(make_job(self.cache_path, 20))
+        real_read_record = FileJobQueue._read_record
+        calls = {"count": 0}
+
+        def read_record(path):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                os.remove(path) # another process moved the claimed file away
+                raise FileNotFoundError(path)
+            return real_read_record(path)
+
+        with mock.patch.object(FileJobQueue, '_read_record', side_effect=read_record):
+            record = queue.claim("w1")
+        self.assertEqual(record["id"], second_id)
+        self.assertIsNone(queue.status(first_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
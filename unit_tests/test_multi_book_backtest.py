@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import pandas as pd
+import numpy as np
+from strategies.mean_reversion import MeanReversionOrderGenerator
+from backtester.momentum_strategy import MomentumOrderGenerator
+from backtester.backtesters.equity_backtest import EquityBacktestEngine
+from backtester.backtesters.multi_book_backtest import MultiBookBacktestEngine
+
+class TestMultiBookBacktestEngine(unittest.TestCase):
+
+    def setUp(self):
+        num_days = 300
+        dates = pd.date_range(start='2023-01-01', periods=num_days, freq='B')
+        np.random.seed(1)
+        self.data = pd.DataFrame({
+            'AAPL': 100 + np.cumsum(np.random.normal(0, 1, size=num_days)),
+            'MSFT': 200 + np.cumsum(np.random.normal(0, 2, size=num_days)),
+        }, index=dates)
+
+    def _sorted_orders(self, order_generator):
+        return sorted(order_generator.generate_orders(self.data), key=lambda order: order['date'])
+
+    def test_books_match_separate_runs(self):
+        books = [
+            ("mean_reversion", self._sorted_orders(MeanReversionOrderGenerator())),
+            ("momentum", self._sorted_orders(MomentumOrderGenerator(window_days=20))),
+        ]
+        results = MultiBookBacktestEngine(initial_cash=100000).run_backtests(books, self.data)
+
+        self.assertEqual(list(results.keys()), ["mean_reversion", "momentum"])
+        for name, orders in books:
+            expected = EquityBacktestEngine(initial_cash=100000).run_backtest(orders, self.data)
+            pd.testing.assert_frame_equal(results[name]["portfolio_values"], expected["portfolio_values"])
+            pd.testing.assert_frame_equal(results[name]["daily_holdings_and_cash"], expected["daily_holdings_and_cash"])
+
+    def test_books_keep_separate_cash(self):
+        date = self.data.index[0]
+        books = [
+            ("buyer", [{"date": date, "type": "BUY", "ticker": "AAPL", "quantity": 10}]),
+            ("idle", []),
+        ]
+        results = MultiBookBacktestEngine(initial_cash=10000).run_backtests(books, self.data)
+
+        self.assertEqual(results["buyer"]["daily_holdings_and_cash"].iloc[-1]["AAPL"], 10)
+        self.assertEqual(results["idle"]["portfolio_values"].iloc[-1]["Portfolio Value"], 10000)
+
+    def test_duplicate_book_names_rejected(self):
+        with self.assertRaises(ValueError):
+            MultiBookBacktestEngine(initial_cash=10000).run_backtests([("a", []), ("a", [])], self.data)
+
+    def test_checkpoint_path_rejected(self):
+        with self.assertRaises(ValueError):
+            MultiBookBacktestEngine(initial_cash=10000, checkpoint_path="run.ckpt")
+
+
+if __name__ == '__main__':
+    unittest.main()
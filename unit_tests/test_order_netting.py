@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import pandas as pd
+import numpy as np
+from strategies.mean_reversion import MeanReversionOrderGenerator
+from backtester.momentum_strategy import MomentumOrderGenerator
+from backtester.backtesters.equity_backtest import EquityBacktestEngine
+from backtester.order_netting import net_orders
+
+def nonzero_holdings(results):
+    holdings = results["daily_holdings_and_cash"]
+    holdings = holdings.loc[:, (holdings != 0).any(axis=0)]
+    return holdings[sorted(holdings.columns)]
+
+class TestOrderNetting(unittest.TestCase):
+
+    def setUp(self):
+        num_days = 400
+        dates = pd.date_range(start='2022-01-03', periods=num_days, freq='B')
+        np.random.seed(4)
+        self.data = pd.DataFrame({
+            ticker: 100 + np.cumsum(np.random.normal(0.05 * i, 1, size=num_days))
+            for i, ticker in enumerate(['AAPL', 'MSFT', 'NVDA', 'XOM'])
+        }, index=dates)
+
+    def assert_same_backtest(self, orders, initial_cash):
+        netted = net_orders(orders)
+        sorted_orders = sorted(orders, key=lambda order: order['date'])
+        expected = EquityBacktestEngine(initial_cash=initial_cash).run_backtest(sorted_orders, self.data)
+        actual = EquityBacktestEngine(initial_cash=initial_cash).run_backtest(netted["orders"], self.data)
+        pd.testing.assert_frame_equal(actual["portfolio_values"], expected["portfolio_values"])
+        pd.testing.assert_frame_equal(nonzero_holdings(actual), nonzero_holdings(expected))
+        return netted
+
+    def test_mean_reversion_orders_preserved_and_reduced(self):
+        orders = MeanReversionOrderGenerator().generate_orders(self.data)
+        # Small cash balance so that some BUYs are rejected
+        netted = self.assert_same_backtest(orders, initial_cash=30000)
+
+        self.assertGreater(netted["eliminated"], 0)
+        self.assertEqual(netted["orders_in"] - netted["orders_out"], netted["eliminated"])
+        self.assertEqual(netted["eliminated"], netted["flat_sells_dropped"] + netted["zero_quantity_dropped"] + netted["sells_merged"])
+        dates = [order['date'] for order in netted["orders"]]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_fractional_orders_preserved(self):
+        orders = MomentumOrderGenerator(window_days=20).generate_orders(self.data)
+        self.assert_same_backtest(orders, initial_cash=100000)
+
+    def test_rules(self):
+        day1, day2 = self.data.index[0], self.data.index[1]
+        orders = [
+            {"date": day1, "type": "SELL", "ticker": "AAPL", "quantity": 10},    # never held
+            {"date": day1, "type": "BUY", "ticker": "AAPL", "quantity": 30},
+            {"date": day1, "type": "BUY", "ticker": "MSFT", "quantity": 0},      # zero quantity
+            {"date": day2, "type": "SELL", "ticker": "AAPL", "quantity": 10},
+            {"date": day2, "type": "SELL", "ticker": "AAPL", "quantity": 25},    # merged with previous
+            {"date": day2, "type": "SELL", "ticker": "AAPL", "quantity": 5},     # position already closed
+        ]
+        netted = self.assert_same_backtest(orders, initial_cash=100000)
+
+        self.assertEqual([(order["type"], order["quantity"]) for order in netted["orders"]], [("BUY", 30), ("SELL", 35)])
+        self.assertEqual(netted["flat_sells_dropped"], 2)
+        self.assertEqual(netted["zero_quantity_dropped"], 1)
+        self.assertEqual(netted["sells_merged"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
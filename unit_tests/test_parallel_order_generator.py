@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import pandas as pd
+import numpy as np
+from strategies.order_generator import OrderGenerator
+from strategies.mean_reversion import MeanReversionOrderGenerator
+from strategies.parallel_order_generator import ParallelOrderGenerator
+from backtester.momentum_strategy import MomentumOrderGenerator
+
+class CrossSectionalOrderGenerator(OrderGenerator):
+    """Buys the best performer of the whole panel, so tickers cannot be split."""
+
+    def generate_orders(self, data):
+        best = data.pct_change().sum().idxmax()
+        return [{"date": data.index[-1], "type": "BUY", "ticker": best, "quantity": 1}]
+
+class TestParallelOrderGenerator(unittest.TestCase):
+
+    def setUp(self):
+        num_days = 250
+        dates = pd.date_range(start='2023-01-02', periods=num_days, freq='B')
+        np.random.seed(7)
+        self.data = pd.DataFrame({
+            f"T{i}": 100 + np.cumsum(np.random.normal(0, 1, size=num_days)) for i in range(7)
+        }, index=dates)
+
+    def test_matches_date_sorted_serial_output(self):
+        for order_generator in (MeanReversionOrderGenerator(), MomentumOrderGenerator(window_days=20)):
+            expected = sorted(order_generator.generate_orders(self.data), key=lambda order: order['date'])
+            actual = ParallelOrderGenerator(order_generator, max_workers=2, num_chunks=3).generate_orders(self.data)
+            self.assertGreater(len(actual), 0)
+            self.assertEqual(actual, expected)
+
+    def test_cross_sectional_generator_falls_back_or_is_rejected(self):
+        order_generator = CrossSectionalOrderGenerator()
+        expected = order_generator.generate_orders(self.data)
+        self.assertEqual(ParallelOrderGenerator(order_generator, max_workers=2).generate_orders(self.data), expected)
+        with self.assertRaises(ValueError):
+            ParallelOrderGenerator(order_generator, max_workers=2, strict=True).generate_orders(self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import tempfile
+import pandas as pd
+import numpy as np
+from strategies.mean_reversion import MeanReversionOrderGenerator
+from backtester.momentum_strategy import MomentumOrderGenerator
+from backtester.backtesters.equity_backtest import EquityBacktestEngine
+from backtester.metrics import ExtendedMetrics
+from backtester.result_store import BacktestResultStore
+
+class CountingEngine(EquityBacktestEngine):
+    calls = 0
+
+    def run_backtest(self, orders, data):
+        CountingEngine.calls += 1
+        return super().run_backtest(orders, data)
+
+class TestBacktestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = BacktestResultStore(self.tmp_dir.name)
+        num_days = 250
+        dates = pd.date_range(start='2023-01-01', periods=num_days, freq='B')
+        np.random.seed(2)
+        self.data = pd.DataFrame({
+            'AAPL': 100 + np.cumsum(np.random.normal(0, 1, size=num_days)),
+            'MSFT': 200 + np.cumsum(np.random.normal(0, 2, size=num_days)),
+        }, index=dates)
+        CountingEngine.calls = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_identical_run_served_from_store(self):
+        first = self.store.run(MeanReversionOrderGenerator(), CountingEngine(initial_cash=100000), self.data, ExtendedMetrics())
+        second = self.store.run(MeanReversionOrderGenerator(), CountingEngine(initial_cash=100000), self.data, ExtendedMetrics())
+
+        self.assertEqual(CountingEngine.calls, 1)
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["key"], second["key"])
+        pd.testing.assert_frame_equal(first["portfolio_values"], second["portfolio_values"])
+        pd.testing.assert_frame_equal(first["daily_holdings_and_cash"], second["daily_holdings_and_cash"])
+        self.assertEqual(first["metrics"]["Sharpe Ratio"], second["metrics"]["Sharpe Ratio"])
+
+    def test_key_changes_with_inputs(self):
+        engine = EquityBacktestEngine(initial_cash=100000)
+        base = self.store.fingerprint(self.data, MomentumOrderGenerator(), engine)
+
+        self.assertEqual(base, self.store.fingerprint(self.data.copy(), MomentumOrderGenerator(), EquityBacktestEngine(initial_cash=100000)))
+        self.assertNotEqual(base, self.store.fingerprint(self.data, MomentumOrderGenerator(window_days=20), engine))
+        self.assertNotEqual(base, self.store.fingerprint(self.data, MomentumOrderGenerator(), EquityBacktestEngine(initial_cash=50000)))
+        self.assertNotEqual(base, self.store.fingerprint(self.data * 1.01, MomentumOrderGenerator(), engine))
+        self.assertNotEqual(base, self.store.fingerprint(self.data, MomentumOrderGenerator(), engine, code_version="v2"))
+
+    def test_list_query_and_gc(self):
+        engine = EquityBacktestEngine(initial_cash=100000)
+        old = self.store.run(MomentumOrderGenerator(window_days=20), engine, self.data, data_version="v1")
+        new = self.store.run(MeanReversionOrderGenerator(), engine, self.data, data_version="v1")
+        os.utime(os.path.join(self.tmp_dir.name, old["key"], "manifest.json"), (0, 0))
+
+        runs = self.store.list_runs()
+        self.assertEqual(set(runs["key"]), {old["key"], new["key"]})
+        self.assertEqual(list(self.store.query(order_generator="MeanReversionOrderGenerator")["key"]), [new["key"]])
+
+        evicted = self.store.gc(self.store.total_bytes() - 1)
+        self.assertEqual(evicted, [old["key"]])
+        self.assertIsNone(self.store.get(old["key"]))
+        self.assertIsNotNone(self.store.get(new["key"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import unittest
+import pandas as pd
+import numpy as np
+from strategies.betting_aginst_beta import BettingAgainstBetaOrderGenerator
+from backtester.backtesters.target_weight_backtest import TargetWeightBacktestEngine
+
+class TestTargetWeightBacktestEngine(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.bdate_range('2023-01-02', periods=4)
+        self.data = pd.DataFrame({
+            'AAPL': [100.0, 110.0, 120.0, 130.0],
+            'MSFT': [50.0, 40.0, 30.0, 20.0],
+        }, index=dates)
+
+    def test_long_short_rebalance(self):
+        target_weights = pd.DataFrame({'AAPL': [0.5, 0.25], 'MSFT': [-0.5, np.nan]}, index=self.data.index[[0, 2]])
+        results = TargetWeightBacktestEngine(initial_cash=10000).run_backtest(target_weights, self.data)
+        holdings = results["daily_holdings_and_cash"]
+
+        # Day 0: 10000 * 0.5 / 100 = 50 AAPL, -10000 * 0.5 / 50 = -100 MSFT, cash unchanged
+        self.assertEqual(holdings.iloc[0]['AAPL'], 50)
+        self.assertEqual(holdings.iloc[0]['MSFT'], -100)
+        self.assertEqual(holdings.iloc[0]['Cash'], 10000)
+        # Day 2: PV = 10000 + 50 * 120 - 100 * 30 - 5000 + 5000 = 13000 -> 27 AAPL, MSFT flat
+        self.assertEqual(results["portfolio_values"].iloc[2]['Portfolio Value'], 13000)
+        self.assertEqual(holdings.iloc[2]['AAPL'], 27)
+        self.assertEqual(holdings.iloc[2]['MSFT'], 0)
+        self.assertEqual(holdings.iloc[3]['Cash'], 13000 - 27 * 120)
+        self.assertEqual(results["portfolio_values"].iloc[3]['Portfolio Value'], 13000 + 27 * 10)
+        self.assertEqual(list(results["trades"].loc[self.data.index[2]]), [-23, 100])
+
+    def test_non_trading_rebalance_date_and_missing_price(self):
+        data = self.data.copy()
+        data.loc[data.index[0], 'MSFT'] = np.nan
+        # 2022-12-31 is a Saturday, so the rebalance applies on the first trading day
+        target_weights = pd.DataFrame({'AAPL': [0.5], 'MSFT': [0.5]}, index=[pd.Timestamp('2022-12-31')])
+        results = TargetWeightBacktestEngine(initial_cash=10000).run_backtest(target_weights, data)
+        holdings = results["daily_holdings_and_cash"]
+
+        self.assertEqual(holdings.iloc[0]['AAPL'], 50)
+        self.assertNotIn('MSFT', holdings.columns)
+        self.assertFalse(results["portfolio_values"]['Portfolio Value'].isna().any())
+
+    def test_bab_target_weights(self):
+        dates = pd.bdate_range('2022-01-03', periods=200)
+        np.random.seed(3)
+        market = np.random.normal(0, 0.01, len(dates))
+        data = {'SPY': pd.DataFrame({'Adj Close': 100 * np.cumprod(1 + market)}, index=dates)}
+        for i in range(30):
+            returns = (0.5 + i * 0.05) * market + np.random.normal(0, 0.005, len(dates))
+            data[f"T{i}"] = pd.DataFrame({'Adj Close': 50 * np.cumprod(1 + returns)}, index=dates)
+
+        order_generator = BettingAgainstBetaOrderGenerator(lookback_period=60)
+        target_weights = order_generator.generate_target_weights(data)
+        self.assertGreater(len(target_weights), 0)
+        np.testing.assert_allclose(target_weights.abs().sum(axis=1), 1.0)
+
+        prices = pd.DataFrame({ticker: df['Adj Close'] for ticker, df in data.items()})
+        pd.testing.assert_frame_equal(order_generator.generate_target_weights(prices), target_weights)
+        results = TargetWeightBacktestEngine(initial_cash=100000).run_backtest(target_weights, prices)
+        self.assertFalse(results["portfolio_values"]['Portfolio Value'].isna().any())
+        self.assertTrue((results["daily_holdings_and_cash"].drop(columns='Cash') < 0).any().any())
+
+
+if __name__ == '__main__':
+    unittest.main()